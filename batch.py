@@ -0,0 +1,231 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from puzzle_io import read_puzzles
+from sudoku import SudokuBoard, SudokuSolver, SudokuValidator
+
+
+@dataclass
+class BatchResult:
+    """Resultado de resolver uno de los tableros de un lote.
+
+    Args:
+        index (int): posición del tablero dentro de la entrada.
+        puzzle (str): tablero de entrada como cadena de 81 caracteres.
+        solution (Optional[str]): solución como cadena de 81 dígitos, o None si no se encontró.
+        status (str): `"solved"`, `"unsolved"` (el resolutor no encontró solución), `"timeout"` (se superó el tiempo por tablero) o
+            `"invalid"` (la entrada no es un tablero válido).
+        elapsed (float): segundos dedicados al tablero, incluyendo la construcción del `SudokuBoard`.
+        solutions (Optional[int]): soluciones encontradas, como máximo el límite pedido. Solo se informa en `count_batch`.
+    """
+    index: int
+    puzzle: str
+    solution: Optional[str]
+    status: str
+    elapsed: float
+    solutions: Optional[int] = None
+
+
+def solve_one(index: int, puzzle: str, algorithm: type = SudokuSolver, timeout: float = None) -> BatchResult:
+    """Función que resuelve un tablero y empaqueta el resultado.
+
+    Args:
+        index (int): posición del tablero dentro de la entrada.
+        puzzle (str): tablero como cadena de 81 dígitos.
+        algorithm (type, optional): clase resolutora con el contrato de `Tester.algorithm`. Defaults to SudokuSolver.
+        timeout (float, optional): segundos máximos de búsqueda. Defaults to None. El límite se aplica fijando el atributo `deadline` del
+            resolutor, que `SudokuSolver` y `DancingLinksSolver` consultan en cada nodo de la búsqueda.
+
+    Returns:
+        BatchResult: resultado del tablero.
+    """
+    start = time.perf_counter()
+    try:
+        board = SudokuBoard(puzzle)
+    except (RuntimeError, ValueError):
+        return BatchResult(index, puzzle, None, "invalid", time.perf_counter() - start)
+
+    solver = algorithm(board)
+    if timeout is not None:
+        solver.deadline = start + timeout
+    try:
+        solved = solver.solve() and SudokuValidator.validate(solver.board)
+    except TimeoutError:
+        return BatchResult(index, puzzle, None, "timeout", time.perf_counter() - start)
+    except RuntimeError:
+        solved = False
+
+    solution = solver.board.to_string() if solved else None
+    return BatchResult(index, puzzle, solution, "solved" if solved else "unsolved", time.perf_counter() - start)
+
+
+def count_one(index: int, puzzle: str, algorithm: type = SudokuSolver, limit: int = 2, timeout: float = None) -> BatchResult:
+    """Función que cuenta las soluciones de un tablero, hasta `limit`, y empaqueta el resultado.
+
+    Args:
+        index (int): posición del tablero dentro de la entrada.
+        puzzle (str): tablero como cadena de 81 dígitos.
+        algorithm (type, optional): clase resolutora con el método `count_solutions(limit)`. Defaults to SudokuSolver.
+        limit (int, optional): cantidad de soluciones a partir de la cual se deja de buscar. Defaults to 2.
+        timeout (float, optional): segundos máximos de búsqueda. Defaults to None.
+
+    Raises:
+        ValueError: Ocurre si `limit` es menor que 1.
+
+    Returns:
+        BatchResult: resultado del tablero, con la primera solución encontrada en `solution` y la cantidad de soluciones en `solutions`.
+    """
+    if limit < 1:
+        raise ValueError(f"El límite de soluciones debe ser al menos 1: {limit}")
+    start = time.perf_counter()
+    try:
+        board = SudokuBoard(puzzle)
+    except (RuntimeError, ValueError):
+        return BatchResult(index, puzzle, None, "invalid", time.perf_counter() - start, 0)
+
+    solver = algorithm(board)
+    if timeout is not None:
+        solver.deadline = start + timeout
+    try:
+        count = solver.count_solutions(limit)
+    except TimeoutError:
+        return BatchResult(index, puzzle, None, "timeout", time.perf_counter() - start)
+
+    return BatchResult(index, puzzle, solver.solution, "solved" if count else "unsolved", time.perf_counter() - start, count)
+
+
+def _solve_chunk(chunk: List[Tuple[int, str]], task: Callable[[int, str], BatchResult]) -> List[BatchResult]:
+    """Resuelve un bloque de tableros dentro de un proceso del pool."""
+    return [task(index, puzzle) for index, puzzle in chunk]
+
+
+def solve_batch(puzzles: Iterable[str], algorithm: type = SudokuSolver, workers: int = None, chunksize: int = 64, timeout: float = None,
+                ordered: bool = True, executor: Executor = None) -> Iterator[BatchResult]:
+    """Generador que reparte un lote de tableros entre varios procesos.
+
+    Los tableros se agrupan en bloques de `chunksize` para amortizar el costo de comunicación entre procesos, y se mantienen a lo sumo
+    `4 * workers` bloques en vuelo, por lo que la entrada puede ser un iterable arbitrariamente grande (por ejemplo, las líneas de un archivo).
+
+    Args:
+        puzzles (Iterable[str]): tableros como cadenas de 81 dígitos.
+        algorithm (type, optional): clase resolutora con el contrato de `Tester.algorithm`. Debe poder importarse desde los procesos del pool.
+            Defaults to SudokuSolver.
+        workers (int, optional): cantidad de procesos. Defaults to None. Por defecto se usa `os.cpu_count()`. Con 1 se resuelve en el proceso
+            actual, sin pool.
+        chunksize (int, optional): tableros por bloque. Defaults to 64.
+        timeout (float, optional): segundos máximos de búsqueda por tablero. Defaults to None.
+        ordered (bool, optional): si es True los resultados se entregan en el orden de la entrada; si es False, a medida que se completan los
+            bloques. Defaults to True.
+        executor (Executor, optional): pool ya creado (y que no se cerrará) sobre el que repartir el trabajo. Defaults to None.
+
+    Yields:
+        BatchResult: resultado de cada tablero.
+    """
+    yield from _dispatch(puzzles, partial(solve_one, algorithm=algorithm, timeout=timeout), workers, chunksize, ordered, executor)
+
+
+def count_batch(puzzles: Iterable[str], limit: int = 2, algorithm: type = SudokuSolver, workers: int = None, chunksize: int = 64,
+                timeout: float = None, ordered: bool = True, executor: Executor = None) -> Iterator[BatchResult]:
+    """Generador que cuenta las soluciones de un lote de tableros repartiéndolos entre varios procesos, como `solve_batch`.
+
+    Con el límite por defecto (2) sirve para rechazar tableros sin solución única: un tablero es válido si `result.solutions == 1`.
+
+    Args:
+        puzzles (Iterable[str]): tableros como cadenas de 81 dígitos.
+        limit (int, optional): cantidad de soluciones a partir de la cual se deja de buscar en cada tablero. Defaults to 2.
+        algorithm (type, optional): clase resolutora con el método `count_solutions(limit)`. Defaults to SudokuSolver.
+        workers (int, optional): cantidad de procesos (ver `solve_batch`). Defaults to None.
+        chunksize (int, optional): tableros por bloque. Defaults to 64.
+        timeout (float, optional): segundos máximos de búsqueda por tablero. Defaults to None.
+        ordered (bool, optional): si es True los resultados se entregan en el orden de la entrada. Defaults to True.
+        executor (Executor, optional): pool ya creado (y que no se cerrará) sobre el que repartir el trabajo. Defaults to None.
+
+    Yields:
+        BatchResult: resultado de cada tablero.
+    """
+    yield from _dispatch(puzzles, partial(count_one, algorithm=algorithm, limit=limit, timeout=timeout), workers, chunksize, ordered, executor)
+
+
+def bounded_map(function: Callable, arguments: Iterable[tuple], workers: int = None, ordered: bool = True,
+                executor: Executor = None) -> Iterator:
+    """Generador que aplica una función a cada tupla de argumentos en un pool de procesos, con a lo sumo `4 * workers` tareas en vuelo.
+
+    Las tareas se envían a medida que se consumen los resultados, por lo que `arguments` puede ser un iterable arbitrariamente grande y la
+    memoria no crece con su longitud.
+
+    Args:
+        function (Callable): función a aplicar. Debe poder importarse desde los procesos del pool.
+        arguments (Iterable[tuple]): argumentos posicionales de cada llamada.
+        workers (int, optional): cantidad de procesos. Defaults to None. Por defecto se usa `os.cpu_count()`. Con 1 se ejecuta en el proceso
+            actual, sin pool.
+        ordered (bool, optional): si es True los resultados se entregan en el orden de `arguments`; si es False, a medida que se completan.
+            Defaults to True.
+        executor (Executor, optional): pool ya creado (y que no se cerrará) sobre el que repartir el trabajo. Defaults to None.
+
+    Yields:
+        Any: resultado de cada llamada.
+    """
+    workers = workers or os.cpu_count() or 1
+    arguments = iter(arguments)
+    if executor is None and workers == 1:
+        for args in arguments:
+            yield function(*args)
+        return
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for args in islice(arguments, 4 * workers):
+            pending.append(executor.submit(function, *args))
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                for args in islice(arguments, 1):
+                    pending.append(executor.submit(function, *args))
+                yield future.result()
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def _dispatch(puzzles: Iterable[str], task: Callable[[int, str], BatchResult], workers: int, chunksize: int, ordered: bool,
+              executor: Executor) -> Iterator[BatchResult]:
+    """Reparte los tableros en bloques entre los procesos y aplica `task` a cada uno."""
+    chunks = ((chunk, task) for chunk in _chunked(enumerate(puzzles), chunksize))
+    for results in bounded_map(_solve_chunk, chunks, workers, ordered, executor):
+        yield from results
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Agrupa un iterable en listas de a lo sumo `size` elementos sin materializarlo."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "boards.txt"
+    solved = total = 0
+    for result in solve_batch((record.puzzle for record in read_puzzles(path)), timeout=10):
+        total += 1
+        solved += result.status == "solved"
+        print(result.solution or result.puzzle, result.status, f"{result.elapsed:.4f}")
+    print(f"Se han resuelto {solved} de {total} tableros")
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+import sudoku
+from generator import generate
+from puzzle_io import read_puzzles
+from sudoku import SudokuBoard, SudokuValidator
+
+BOARDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boards.txt")
+
+SEVENTEEN_CLUES = [
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+    "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+    "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    "000000012300000060000040000900000500000001070020000000000350400001400800060000000",
+]
+"""Tableros conocidos de 17 pistas (el mínimo posible) con solución única."""
+
+GENERATED_CLUES = {"easy": 36, "medium": 30, "hard": 25}
+"""Cantidad de pistas de los corpus generados."""
+
+TIERS = ["sudokus", "boards", "easy", "medium", "hard", "seventeen"]
+"""Corpus disponibles, de menor a mayor dificultad esperada."""
+
+HIGHER_IS_BETTER = {"solved", "puzzles_per_sec"}
+"""Métricas en las que un valor menor que el de referencia es una regresión. En el resto, lo es un valor mayor."""
+
+
+def generate_puzzles(count: int, clues: int, seed: int = 0) -> List[str]:
+    """Función que genera tableros con solución única y `clues` pistas (ver `generator.generate`), reproducibles para una misma semilla.
+
+    Args:
+        count (int): cantidad de tableros.
+        clues (int): pistas de cada tablero.
+        seed (int, optional): semilla del generador aleatorio. Defaults to 0.
+
+    Returns:
+        List[str]: tableros como cadenas de 81 dígitos.
+    """
+    return [item.puzzle for item in generate(count, clues, seed)]
+
+
+def load_corpus(tier: str, size: int = 50, seed: int = 0) -> List[str]:
+    """Función que obtiene los tableros de un corpus.
+
+    Args:
+        tier (str): uno de `TIERS`: `"sudokus"` (lista de `sudoku.py`), `"boards"` (`boards.txt`), `"easy"`, `"medium"` y `"hard"`
+            (generados) o `"seventeen"` (tableros de 17 pistas).
+        size (int, optional): tableros de los corpus generados. Defaults to 50.
+        seed (int, optional): semilla de los corpus generados. Defaults to 0.
+
+    Raises:
+        ValueError: Ocurre si el corpus no existe.
+
+    Returns:
+        List[str]: tableros como cadenas de 81 dígitos.
+    """
+    if tier == "sudokus":
+        return list(sudoku.sudokus)
+    if tier == "boards":
+        return [record.puzzle for record in read_puzzles(BOARDS_FILE)]
+    if tier == "seventeen":
+        return list(SEVENTEEN_CLUES)
+    if tier in GENERATED_CLUES:
+        return generate_puzzles(size, GENERATED_CLUES[tier], seed)
+    raise ValueError(f"Corpus desconocido: {tier}")
+
+
+def run_tier(puzzles: List[str], algorithm: type, repeat: int = 1, measure_memory: bool = True) -> Dict:
+    """Función que mide el desempeño de un resolutor sobre un corpus.
+
+    Los tiempos se toman sin `tracemalloc`, que ralentiza la ejecución; si se mide memoria, se hace en una pasada adicional.
+
+    Args:
+        puzzles (List[str]): tableros del corpus.
+        algorithm (type): clase resolutora con el contrato de `Tester.algorithm`.
+        repeat (int, optional): veces que se resuelve el corpus; se conserva la latencia mínima de cada tablero. Defaults to 1.
+        measure_memory (bool, optional): si es True se mide el pico de memoria por tablero. Defaults to True.
+
+    Returns:
+        Dict: métricas del corpus: tableros, resueltos, tableros por segundo, percentiles de latencia en milisegundos, nodos y retrocesos
+            totales y pico de memoria en KiB.
+    """
+    latencies = [float("inf")] * len(puzzles)
+    solved = nodes = backtracks = 0
+    for round_ in range(repeat):
+        for position, puzzle in enumerate(puzzles):
+            start = time.perf_counter()
+            board = SudokuBoard(puzzle)
+            solver = algorithm(board)
+            ok = solver.solve()
+            latencies[position] = min(latencies[position], time.perf_counter() - start)
+            if round_ == 0:
+                solved += ok and SudokuValidator.validate(solver.board)
+                nodes += getattr(solver, "nodes", 0)
+                backtracks += getattr(solver, "backtracks", 0)
+
+    peak = 0
+    if measure_memory:
+        tracemalloc.start()
+        for puzzle in puzzles:
+            tracemalloc.reset_peak()
+            algorithm(SudokuBoard(puzzle)).solve()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "puzzles": len(puzzles),
+        "solved": solved,
+        "puzzles_per_sec": round(len(puzzles) / sum(ordered), 2) if ordered else 0.0,
+        "latency_ms": latency_percentiles(ordered),
+        "nodes": nodes,
+        "backtracks": backtracks,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(algorithms: List[type], tiers: List[str] = TIERS, size: int = 50, seed: int = 0, repeat: int = 1,
+                  measure_memory: bool = True) -> Dict:
+    """Función que ejecuta el benchmark completo.
+
+    Args:
+        algorithms (List[type]): clases resolutoras a medir.
+        tiers (List[str], optional): corpus a usar. Defaults to TIERS.
+        size (int, optional): tableros de los corpus generados. Defaults to 50.
+        seed (int, optional): semilla de los corpus generados. Defaults to 0.
+        repeat (int, optional): veces que se resuelve cada corpus. Defaults to 1.
+        measure_memory (bool, optional): si es True se mide el pico de memoria. Defaults to True.
+
+    Returns:
+        Dict: reporte serializable a JSON con los metadatos de la ejecución y las métricas por resolutor y corpus.
+    """
+    corpora = {tier: load_corpus(tier, size, seed) for tier in tiers}
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "size": size, "seed": seed, "repeat": repeat},
+        "results": {algorithm.__name__: {tier: run_tier(puzzles, algorithm, repeat, measure_memory) for tier, puzzles in corpora.items()}
+                    for algorithm in algorithms},
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.15) -> List[str]:
+    """Función que compara un reporte con uno de referencia y lista las regresiones.
+
+    Args:
+        current (Dict): reporte actual, como el que retorna `run_benchmark`.
+        baseline (Dict): reporte de referencia.
+        tolerance (float, optional): variación relativa admitida antes de considerar una métrica como regresión. Defaults to 0.15.
+
+    Returns:
+        List[str]: descripción de cada regresión encontrada. Vacía si no hay ninguna.
+    """
+    regressions = []
+    for algorithm, tiers in current["results"].items():
+        for tier, metrics in tiers.items():
+            reference = baseline.get("results", {}).get(algorithm, {}).get(tier)
+            if reference is None:
+                continue
+            for name, value, old in _flatten(metrics, reference):
+                if name == "puzzles" or not old:
+                    continue
+                change = (value - old) / old
+                if (change < -tolerance) if name in HIGHER_IS_BETTER else (change > tolerance):
+                    regressions.append(f"{algorithm}/{tier}/{name}: {old} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def _flatten(metrics: Dict, reference: Dict, prefix: str = ""):
+    """Recorre en paralelo las métricas (posiblemente anidadas) de dos reportes."""
+    for name, value in metrics.items():
+        old = reference.get(name)
+        if isinstance(value, dict) and isinstance(old, dict):
+            yield from _flatten(value, old, prefix + name + ".")
+        elif old is not None:
+            yield prefix + name, value, old
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Función que calcula un percentil por rango más cercano.
+
+    Args:
+        ordered (List[float]): valores ordenados de menor a mayor.
+        q (float): percentil, entre 0 y 100.
+
+    Returns:
+        float: valor del percentil, o 0.0 si la lista está vacía.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def latency_percentiles(ordered: List[float]) -> Dict[str, float]:
+    """Función que resume latencias en segundos con sus percentiles p50, p95, p99 y máximo, en milisegundos.
+
+    Args:
+        ordered (List[float]): latencias en segundos, ordenadas de menor a mayor.
+
+    Returns:
+        Dict[str, float]: percentiles `p50`, `p95`, `p99` y `max` en milisegundos, redondeados a 3 decimales.
+    """
+    return {name: round(percentile(ordered, q) * 1000, 3) for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))}
+
+
+def main(argv: List[str] = None) -> int:
+    """Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: 0 si no hubo regresiones respecto a la referencia, 1 en caso contrario.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de los resolutores de sudoku.")
+    parser.add_argument("--algorithms", nargs="+", default=["SudokuSolver", "DancingLinksSolver"], help="clases resolutoras de sudoku.py")
+    parser.add_argument("--tiers", nargs="+", default=TIERS, choices=TIERS, help="corpus a medir")
+    parser.add_argument("--size", type=int, default=50, help="tableros de cada corpus generado")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de los corpus generados")
+    parser.add_argument("--repeat", type=int, default=1, help="veces que se resuelve cada corpus")
+    parser.add_argument("--no-memory", action="store_true", help="no medir el pico de memoria")
+    parser.add_argument("--output", help="archivo JSON donde guardar el reporte")
+    parser.add_argument("--baseline", help="reporte JSON de referencia contra el cual comparar")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="variación relativa admitida antes de reportar una regresión")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark([getattr(sudoku, name) for name in args.algorithms], args.tiers, args.size, args.seed, args.repeat,
+                           not args.no_memory)
+    for algorithm, tiers in report["results"].items():
+        for tier, metrics in tiers.items():
+            latency = metrics["latency_ms"]
+            print(f"{algorithm:<20} {tier:<10} {metrics['solved']:>4}/{metrics['puzzles']:<4} {metrics['puzzles_per_sec']:>9.1f} tab/s "
+                  f"p50 {latency['p50']:>8.3f} ms  p95 {latency['p95']:>8.3f} ms  p99 {latency['p99']:>8.3f} ms  "
+                  f"nodos {metrics['nodes']:>7}  retrocesos {metrics['backtracks']:>7}  memoria {metrics['peak_memory_kb']:>7.1f} KiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regresión: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
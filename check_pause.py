@@ -0,0 +1,76 @@
+import argparse
+import sys
+from typing import Iterable, List
+
+from puzzle_io import read_puzzles
+from sudoku import SudokuBoard, SudokuSolver, SudokuValidator, sudokus
+
+REGRESSIONS = [
+    "306000002005380000901002000000800006002040100000103500500001800009000007003608400",
+]
+"""Tableros con solución única en los que una búsqueda reiniciada tras una pausa conservaba las suposiciones pausadas y fallaba."""
+
+
+def check_restart(puzzles: Iterable[str], max_nodes: int = 2) -> List[str]:
+    """Función que verifica que una búsqueda en pausa de `SudokuSolver` no altere la siguiente.
+
+    Para cada tablero pausa una búsqueda tras `max_nodes` asignaciones y comprueba que:
+    - volver a llamar a `solve` encuentre una solución válida, la misma que sin pausa si el tablero tiene solución única (con varias, el
+      orden en que se exploran las celdas empatadas puede cambiar tras deshacer la pausa),
+    - `count_solutions` cuente lo mismo que sin pausa,
+    - `cancel` deje el tablero como al empezar y sin puntos de control abiertos.
+
+    Args:
+        puzzles (Iterable[str]): tableros como cadenas de un carácter por celda.
+        max_nodes (int, optional): asignaciones antes de pausar la primera búsqueda. Defaults to 2.
+
+    Returns:
+        List[str]: descripción de cada verificación fallida. Vacía si no hay ninguna.
+    """
+    failures = []
+    for puzzle in puzzles:
+        expected = SudokuSolver(SudokuBoard(puzzle))
+        expected.solve()
+        count = SudokuSolver(SudokuBoard(puzzle)).count_solutions(limit=2)
+
+        solver = SudokuSolver(SudokuBoard(puzzle))
+        if solver.solve(max_nodes=max_nodes) is not None:
+            continue
+        if not solver.solve() or not SudokuValidator.validate(solver.board) or (count == 1 and solver.solution != expected.solution):
+            failures.append(f"solve tras pausa ({max_nodes} asignaciones): {puzzle}")
+
+        solver = SudokuSolver(SudokuBoard(puzzle))
+        solver.solve(max_nodes=max_nodes)
+        if solver.count_solutions(limit=2) != count:
+            failures.append(f"count_solutions tras pausa ({max_nodes} asignaciones): {puzzle}")
+
+        solver = SudokuSolver(SudokuBoard(puzzle))
+        initial = solver.board.to_string()
+        solver.solve(max_nodes=max_nodes)
+        solver.cancel()
+        if solver.paused or solver.board._checkpoints or solver.board.to_string() != initial:
+            failures.append(f"cancel tras pausa ({max_nodes} asignaciones): {puzzle}")
+    return failures
+
+
+def main(argv: List[str] = None) -> int:
+    """Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: 0 si todas las verificaciones pasaron, 1 en caso contrario.
+    """
+    parser = argparse.ArgumentParser(description="Verifica que las búsquedas en pausa de SudokuSolver no alteren las siguientes.")
+    parser.add_argument("source", nargs="?", help="archivo de tableros (por defecto, los de sudoku.py y las regresiones conocidas)")
+    parser.add_argument("--max-nodes", type=int, nargs="+", default=[1, 2, 3], help="asignaciones antes de pausar")
+    args = parser.parse_args(argv)
+
+    puzzles = [record.puzzle for record in read_puzzles(args.source)] if args.source else sudokus + REGRESSIONS
+    failures = [failure for max_nodes in args.max_nodes for failure in check_restart(puzzles, max_nodes)]
+    for failure in failures:
+        print(f"Error: {failure}")
+    print(f"Se han verificado {len(puzzles)} tableros con {len(failures)} errores")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from batch import bounded_map
+from puzzle_io import PuzzleRecord, write_puzzles
+from sudoku import COL_OF, FULL_MASK, MASK_VALUES, PEERS, ROW_OF, SudokuBoard, SudokuSolver
+
+DIFFICULTIES = ["easy", "medium", "hard", "expert"]
+"""Niveles de dificultad, de menor a mayor."""
+
+MAX_ATTEMPTS = 100
+"""Tableros generados, como máximo, por cada tablero pedido de una dificultad dada."""
+
+LEVEL_DIFFICULTY = {0: "easy", 1: "easy", 2: "easy", 3: "medium", 4: "hard", 5: "hard"}
+"""Dificultad de los tableros que se resuelven sin búsqueda, según el nivel de inferencia que necesitan (ver `SudokuBoard.INFERENCE_RULES`).
+Los que requieren búsqueda son `"expert"`."""
+
+MAX_INFERENCE_LEVEL = max(level for level, *_ in SudokuBoard.INFERENCE_RULES)
+"""Nivel de inferencia más alto que se prueba al calificar."""
+
+DIGIT_BITS = {"0": 0, **{str(value): 1 << (value - 1) for value in range(1, 10)}}
+"""Máscara de cada carácter de celda (0 para una celda vacía)."""
+
+
+@dataclass
+class Grade:
+    """Calificación de la dificultad de un tablero.
+
+    Args:
+        level (Optional[int]): menor nivel de inferencia con el que la propagación resuelve el tablero, o None si necesita búsqueda.
+        guesses (int): asignaciones que `SudokuSolver` intentó durante la búsqueda (0 si no la necesitó).
+        eliminations (Dict[str, int]): candidatos eliminados por cada regla antes de la búsqueda.
+        difficulty (str): uno de `DIFFICULTIES`.
+    """
+    level: Optional[int]
+    guesses: int
+    eliminations: Dict[str, int] = field(default_factory=dict)
+    difficulty: str = "easy"
+
+
+@dataclass
+class GeneratedPuzzle:
+    """Tablero generado.
+
+    Args:
+        puzzle (str): tablero como cadena de 81 dígitos, con 0 en las celdas vacías.
+        solution (str): solución única del tablero.
+        grade (Grade): calificación de su dificultad.
+    """
+    puzzle: str
+    solution: str
+    grade: Grade
+
+    @property
+    def clues(self) -> int:
+        """int: cantidad de pistas del tablero."""
+        return 81 - self.puzzle.count("0")
+
+
+def random_grid(rng: random.Random) -> str:
+    """Función que genera una solución completa al azar, resolviendo un tablero vacío con los valores en orden aleatorio.
+
+    Args:
+        rng (random.Random): generador aleatorio.
+
+    Returns:
+        str: solución como cadena de 81 dígitos.
+    """
+    def shuffled_values(board: SudokuBoard, index: int) -> List[int]:
+        values = list(MASK_VALUES[board.masks[index]])
+        rng.shuffle(values)
+        return values
+
+    board = SudokuBoard()
+    SudokuSolver(board, value_order=shuffled_values).solve()
+    return board.to_string()
+
+
+def remove_clues(solution: str, clues: int, rng: random.Random) -> str:
+    """Función que quita pistas de una solución, en orden aleatorio, mientras el tablero conserve solución única.
+
+    Quitar la pista `v` de una celda de un tablero con solución única mantiene la unicidad si y solo si el tablero sin esa pista no tiene
+    solución con otro valor en la celda. Por eso cada intento cuesta a lo sumo una resolución: se prohíbe `v` en la celda y se busca una
+    solución; en la mayoría de los casos la propagación del tablero ya descarta la alternativa sin buscar. Mientras el tablero tiene muchas
+    pistas, los pares de la celda suelen cubrir los otros 8 valores y la pista se quita sin construir un tablero.
+
+    Args:
+        solution (str): solución completa como cadena de 81 dígitos.
+        clues (int): cantidad de pistas buscada. Si no es posible llegar a ella sin perder la unicidad, se detiene antes.
+        rng (random.Random): generador aleatorio.
+
+    Returns:
+        str: tablero con solución única y al menos `clues` pistas.
+    """
+    cells = list(solution)
+    remaining = 81
+    for index in rng.sample(range(81), 81):
+        if remaining <= clues:
+            break
+        value = cells[index]
+        cells[index] = "0"
+        seen = 0
+        for peer in PEERS[index]:
+            seen |= DIGIT_BITS[cells[peer]]
+        if seen != FULL_MASK ^ DIGIT_BITS[value] and _has_other_solution("".join(cells), index, int(value)):
+            cells[index] = value
+        else:
+            remaining -= 1
+    return "".join(cells)
+
+
+def _has_other_solution(puzzle: str, index: int, value: int) -> bool:
+    """Indica si el tablero tiene alguna solución en la que la celda `index` no vale `value`."""
+    board = SudokuBoard(puzzle)
+    var = board.var(ROW_OF[index], COL_OF[index])
+    others = [other for other in var.domain if other != value]
+    if not others:
+        return False
+    var.domain = others
+    try:
+        board.propagate_constraints()
+    except RuntimeError:
+        return False
+    return SudokuSolver(board).solve()
+
+
+def grade(puzzle: str) -> Grade:
+    """Función que califica la dificultad de un tablero según las reglas de inferencia y las suposiciones que necesita.
+
+    Se propaga primero solo con la eliminación en pares y se sube el nivel de inferencia de a uno, sobre el mismo tablero, hasta que quede
+    resuelto. Si ni el último nivel alcanza, se resuelve con `SudokuSolver` y se cuentan sus asignaciones.
+
+    Args:
+        puzzle (str): tablero como cadena de 81 dígitos.
+
+    Raises:
+        RuntimeError: Ocurre si el tablero viola alguna restricción.
+
+    Returns:
+        Grade: calificación del tablero.
+    """
+    board = SudokuBoard(puzzle, inference_level=0)
+    eliminations = dict.fromkeys(board.eliminations, 0)
+    for level in range(MAX_INFERENCE_LEVEL + 1):
+        if level:
+            board.set_inference_level(level)
+            board.propagate_constraints()
+        for rule, count in board.eliminations.items():
+            eliminations[rule] += count
+        if not board.unassigned_count:
+            return Grade(level, 0, eliminations, LEVEL_DIFFICULTY[level])
+
+    solver = SudokuSolver(board)
+    solver.solve()
+    return Grade(None, solver.stats.assignments, eliminations, "expert")
+
+
+def generate(count: int, clues: int = 25, seed: int = None, difficulty: str = None,
+             max_attempts: int = MAX_ATTEMPTS) -> Iterator[GeneratedPuzzle]:
+    """Generador de tableros con solución única, calificados por dificultad.
+
+    Args:
+        count (int): cantidad de tableros.
+        clues (int, optional): pistas buscadas en cada tablero. Por debajo de unas 22 pistas la mayoría de los tableros se detiene antes de
+            alcanzarlas. Defaults to 25.
+        seed (int, optional): semilla del generador aleatorio. Defaults to None.
+        difficulty (str, optional): si se indica, uno de `DIFFICULTIES`: solo se entregan tableros de esa dificultad (los demás se
+            descartan). Defaults to None.
+        max_attempts (int, optional): tableros generados, como máximo, por cada tablero pedido. Si una dificultad es demasiado rara para la
+            cantidad de pistas, la generación se detiene al agotar `max_attempts * count` intentos y entrega menos tableros. Defaults to
+            MAX_ATTEMPTS.
+
+    Raises:
+        ValueError: Ocurre si `difficulty` no es una de `DIFFICULTIES`.
+
+    Yields:
+        GeneratedPuzzle: cada tablero generado.
+    """
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f"Dificultad desconocida: {difficulty}. Se admiten {DIFFICULTIES}.")
+    rng = random.Random(seed)
+    produced = attempts = 0
+    while produced < count and attempts < max_attempts * count:
+        attempts += 1
+        solution = random_grid(rng)
+        puzzle = remove_clues(solution, clues, rng)
+        result = GeneratedPuzzle(puzzle, solution, grade(puzzle))
+        if difficulty is None or result.grade.difficulty == difficulty:
+            produced += 1
+            yield result
+
+
+def _generate_chunk(count: int, clues: int, seed: int, difficulty: str, max_attempts: int) -> List[GeneratedPuzzle]:
+    """Genera un bloque de tableros dentro de un proceso del pool."""
+    return list(generate(count, clues, seed, difficulty, max_attempts))
+
+
+def generate_parallel(count: int, clues: int = 25, seed: int = None, difficulty: str = None, workers: int = None,
+                      chunksize: int = 64, max_attempts: int = MAX_ATTEMPTS) -> Iterator[GeneratedPuzzle]:
+    """Generador que reparte la generación de tableros entre varios procesos.
+
+    Cada bloque de `chunksize` tableros se genera con su propia semilla, derivada de `seed` y de la posición del bloque, por lo que el
+    resultado es reproducible para una misma semilla y tamaño de bloque, sin importar la cantidad de procesos. Los bloques se envían al pool
+    a medida que se consumen los tableros (ver `batch.bounded_map`), por lo que generar millones de tableros no acumula resultados en memoria.
+
+    Args:
+        count (int): cantidad de tableros.
+        clues (int, optional): pistas buscadas en cada tablero. Defaults to 25.
+        seed (int, optional): semilla del generador aleatorio. Defaults to None.
+        difficulty (str, optional): si se indica, solo se entregan tableros de esa dificultad. Defaults to None.
+        workers (int, optional): cantidad de procesos. Defaults to None. Por defecto se usa `os.cpu_count()`. Con 1 se genera en el proceso
+            actual, sin pool.
+        chunksize (int, optional): tableros por bloque. Defaults to 64.
+        max_attempts (int, optional): tableros generados, como máximo, por cada tablero pedido (ver `generate`). Defaults to MAX_ATTEMPTS.
+
+    Raises:
+        ValueError: Ocurre si `difficulty` no es una de `DIFFICULTIES`.
+
+    Yields:
+        GeneratedPuzzle: cada tablero generado, en el orden de los bloques.
+    """
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f"Dificultad desconocida: {difficulty}. Se admiten {DIFFICULTIES}.")
+    workers = workers or os.cpu_count() or 1
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    chunks = ((min(chunksize, count - start), clues, seed * 1_000_003 + start, difficulty, max_attempts)
+              for start in range(0, count, chunksize))
+    if workers == 1:
+        for chunk in chunks:
+            yield from generate(*chunk)
+        return
+
+    for generated in bounded_map(_generate_chunk, chunks, workers):
+        yield from generated
+
+
+def write_generated(target, count: int, clues: int = 25, seed: int = None, difficulty: str = None, workers: int = None,
+                    chunksize: int = 64, max_attempts: int = MAX_ATTEMPTS) -> int:
+    """Función que genera tableros en paralelo y los escribe a medida que se completan, una línea por tablero con su dificultad como código.
+
+    Args:
+        target (str | os.PathLike | IO[str]): ruta del archivo (se comprime con gzip si termina en `.gz`) o archivo de texto ya abierto.
+        count (int): cantidad de tableros.
+        clues, seed, difficulty, workers, chunksize, max_attempts: ver `generate_parallel`.
+
+    Returns:
+        int: cantidad de tableros escritos.
+    """
+    puzzles = generate_parallel(count, clues, seed, difficulty, workers, chunksize, max_attempts)
+    return write_puzzles(target, (PuzzleRecord(item.puzzle, item.grade.difficulty) for item in puzzles))
+
+
+def main(argv: List[str] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Generador de tableros de sudoku con solución única.")
+    parser.add_argument("output", help="archivo donde escribir los tableros (gzip si termina en .gz)")
+    parser.add_argument("--count", type=int, default=100, help="cantidad de tableros")
+    parser.add_argument("--clues", type=int, default=25, help="pistas buscadas en cada tablero")
+    parser.add_argument("--seed", type=int, help="semilla del generador aleatorio")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, help="generar solo tableros de esta dificultad")
+    parser.add_argument("--workers", type=int, help="cantidad de procesos")
+    parser.add_argument("--chunksize", type=int, default=64, help="tableros por bloque")
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help="tableros generados, como máximo, por cada tablero pedido")
+    args = parser.parse_args(argv)
+
+    written = write_generated(args.output, args.count, args.clues, args.seed, args.difficulty, args.workers, args.chunksize,
+                              args.max_attempts)
+    print(f"Se han generado {written} tableros")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import contextlib
+import gzip
+import io
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from sudoku import SudokuBoard
+
+CELL_CHARS = "0123456789."
+"""Caracteres que representan una celda: un dígito, o `0`/`.` para una celda vacía."""
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+_BLANK_TO_ZERO = str.maketrans(".", "0")
+_SEPARATORS = str.maketrans("", "", " \t|-+")
+
+
+def normalize_puzzle(puzzle: str) -> str:
+    """Función que normaliza las celdas vacías de un tablero, reemplazando cada `.` por `0`.
+
+    Args:
+        puzzle (str): tablero como cadena de un carácter por celda.
+
+    Returns:
+        str: tablero con `0` en las celdas vacías.
+    """
+    return puzzle.translate(_BLANK_TO_ZERO)
+
+
+@dataclass
+class PuzzleRecord:
+    """Tablero leído de un archivo.
+
+    Args:
+        puzzle (str): tablero como cadena de 81 dígitos, con 0 en las celdas vacías.
+        code (Optional[str]): texto que acompaña al tablero en su línea (por ejemplo, el código de sudokumania de `boards.txt`).
+        line (int): número de línea (desde 1) en el que termina el tablero dentro del archivo.
+    """
+    puzzle: str
+    code: Optional[str] = None
+    line: int = 0
+
+
+def read_puzzles(source) -> Iterator[PuzzleRecord]:
+    """Generador que lee tableros de un archivo de cualquier tamaño, línea por línea y sin cargarlo en memoria.
+
+    Se reconocen los siguientes formatos, incluso mezclados en un mismo archivo:
+    - Una línea por tablero con 81 caracteres (`0` o `.` para las celdas vacías), seguidos opcionalmente de un código, como en `boards.txt`.
+    - Tableros en 9 líneas de 9 celdas, ignorando separadores (`|`, `-`, `+`, espacios) y líneas de encabezado como `Grid 01`.
+    Las líneas vacías y las que comienzan con `#` se ignoran. Los archivos comprimidos con gzip se detectan automáticamente.
+
+    Args:
+        source (str | os.PathLike | IO[str]): ruta del archivo o archivo de texto ya abierto.
+
+    Yields:
+        PuzzleRecord: cada tablero encontrado.
+    """
+    with _open(source, "r") as file:
+        rows = []
+        for number, line in enumerate(file, 1):
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            fields = text.split(None, 1)
+            if len(fields[0]) == 81 and _is_cells(fields[0]):
+                rows.clear()
+                code = fields[1].strip() if len(fields) > 1 else None
+                yield PuzzleRecord(normalize_puzzle(fields[0]), code, number)
+                continue
+
+            cells = text.translate(_SEPARATORS)
+            if not cells:
+                continue
+            if len(cells) == 9 and _is_cells(cells):
+                rows.append(cells)
+                if len(rows) == 9:
+                    yield PuzzleRecord(normalize_puzzle("".join(rows)), None, number)
+                    rows.clear()
+            else:
+                rows.clear()
+
+
+def iter_boards(source, skip_invalid: bool = True, **board_options) -> Iterator[Tuple[PuzzleRecord, SudokuBoard]]:
+    """Generador que lee tableros de un archivo y los carga directamente como `SudokuBoard`.
+
+    Args:
+        source (str | os.PathLike | IO[str]): ruta del archivo o archivo de texto ya abierto.
+        skip_invalid (bool, optional): si es True se omiten los tableros que violan alguna restricción. Defaults to True.
+        **board_options: argumentos adicionales para el constructor de `SudokuBoard` (por ejemplo, `inference_level`).
+
+    Raises:
+        RuntimeError: Ocurre si un tablero viola alguna restricción y `skip_invalid` es False.
+
+    Yields:
+        Tuple[PuzzleRecord, SudokuBoard]: cada registro junto con su tablero ya propagado.
+    """
+    for record in read_puzzles(source):
+        try:
+            board = SudokuBoard(record.puzzle, **board_options)
+        except RuntimeError:
+            if skip_invalid:
+                continue
+            raise
+        yield record, board
+
+
+def write_puzzles(target, records: Iterable[Union[PuzzleRecord, str, SudokuBoard]], blank: str = "0") -> int:
+    """Función que escribe tableros (o soluciones) a medida que se generan, una línea por tablero en el formato de `boards.txt`.
+
+    Args:
+        target (str | os.PathLike | IO[str]): ruta del archivo (se comprime con gzip si termina en `.gz`) o archivo de texto ya abierto.
+        records (Iterable[PuzzleRecord | str | SudokuBoard]): tableros a escribir. De los `PuzzleRecord` también se escribe el código.
+        blank (str, optional): carácter para las celdas vacías. Defaults to "0".
+
+    Returns:
+        int: cantidad de tableros escritos.
+    """
+    to_blank = str.maketrans("0", blank)
+    count = 0
+    with _open(target, "w") as file:
+        for record in records:
+            if isinstance(record, SudokuBoard):
+                line = record.to_string()
+            elif isinstance(record, PuzzleRecord):
+                line = f"{record.puzzle} {record.code}" if record.code else record.puzzle
+            else:
+                line = record
+            file.write(line[:81].translate(to_blank) + line[81:] + "\n")
+            count += 1
+    return count
+
+
+def _is_cells(text: str) -> bool:
+    """Indica si la cadena solo contiene caracteres de celda."""
+    return all(char in CELL_CHARS for char in text)
+
+
+def _open(source, mode: str):
+    """Abre una ruta en modo texto (con gzip si corresponde) o envuelve un archivo ya abierto sin cerrarlo al terminar."""
+    if hasattr(source, "read") or hasattr(source, "write"):
+        return contextlib.nullcontext(source)
+    if mode == "r":
+        with open(source, "rb") as probe:
+            compressed = probe.read(2) == GZIP_MAGIC
+    else:
+        compressed = str(source).endswith(".gz")
+    if compressed:
+        return io.TextIOWrapper(gzip.open(source, mode + "b"), encoding="utf-8")
+    return open(source, mode, encoding="utf-8")
@@ -0,0 +1,410 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from batch import BatchResult, count_one, solve_one
+from benchmark import latency_percentiles
+from sudoku import SudokuSolver, sudokus
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+"""Textos de los códigos de estado HTTP que responde el servicio."""
+
+MAX_BODY = 1 << 20
+"""Tamaño máximo en bytes del cuerpo de una petición."""
+
+
+@dataclass
+class _Request:
+    """Petición encolada a la espera de un lote."""
+    index: int
+    puzzle: str
+    limit: Optional[int]
+    deadline: float
+    future: asyncio.Future
+
+
+def _run_batch(items: List[Tuple[int, str, Optional[int], float]], algorithm: type) -> List[BatchResult]:
+    """Resuelve (o cuenta, si la petición trae un límite) un lote de tableros dentro de un proceso del pool.
+
+    Cada elemento trae el plazo de su petición como instante de `time.time()`, compartido entre procesos: cada tablero se busca solo durante
+    el tiempo que le queda al empezar (descontando la espera en el pool y los tableros anteriores del lote), y los que ya vencieron se
+    responden como `"timeout"` sin resolverse.
+    """
+    results = []
+    for index, puzzle, limit, deadline in items:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            results.append(BatchResult(index, puzzle, None, "timeout", 0.0))
+        elif limit:
+            results.append(count_one(index, puzzle, algorithm, limit, timeout))
+        else:
+            results.append(solve_one(index, puzzle, algorithm, timeout))
+    return results
+
+
+def _warm(algorithm: type) -> int:
+    """Importa los módulos y resuelve un tablero en un proceso del pool, para que la primera petición real no pague ese costo."""
+    solve_one(0, sudokus[0], algorithm)
+    return os.getpid()
+
+
+class ServiceMetrics:
+    """Métricas de throughput y latencia del servicio.
+
+    Los contadores cubren toda la vida del servicio; los percentiles de latencia y el throughput reciente se calculan sobre las últimas
+    `window` peticiones completadas.
+    """
+
+    def __init__(self, window: int = 1024):
+        """Constructor
+
+        Args:
+            window (int, optional): peticiones recientes sobre las que se calculan latencias y throughput. Defaults to 1024.
+        """
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.batches = 0
+        self.batched = 0
+        self.max_batch = 0
+        self.latencies = deque(maxlen=window)
+        self.completions = deque(maxlen=window)
+
+    def record_batch(self, size: int) -> None:
+        """Anota un lote enviado al pool."""
+        self.batches += 1
+        self.batched += size
+        self.max_batch = max(self.max_batch, size)
+
+    def record(self, status: str, latency: float) -> None:
+        """Anota una petición completada con su estado y su latencia en segundos (desde que se recibió hasta que se respondió)."""
+        self.statuses[status] += 1
+        self.latencies.append(latency)
+        self.completions.append(time.perf_counter())
+
+    def snapshot(self, queued: int = 0, in_flight: int = 0) -> Dict:
+        """Método que resume las métricas.
+
+        Args:
+            queued (int, optional): peticiones a la espera de un lote. Defaults to 0.
+            in_flight (int, optional): lotes en proceso. Defaults to 0.
+
+        Returns:
+            Dict: métricas serializables a JSON: tiempo activo, peticiones recibidas y completadas por estado, lotes y su tamaño medio y
+                máximo, throughput total y reciente (peticiones por segundo) y percentiles de latencia en milisegundos.
+        """
+        now = time.perf_counter()
+        uptime = now - self.started
+        completed = sum(self.statuses.values())
+        recent = len(self.completions) / (now - self.completions[0]) if len(self.completions) > 1 and now > self.completions[0] else 0.0
+        ordered = sorted(self.latencies)
+        return {
+            "uptime_sec": round(uptime, 3),
+            "requests": self.requests,
+            "completed": completed,
+            "statuses": dict(self.statuses),
+            "queued": queued,
+            "batches_in_flight": in_flight,
+            "batches": self.batches,
+            "mean_batch": round(self.batched / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "throughput_per_sec": round(completed / uptime, 2) if uptime else 0.0,
+            "recent_throughput_per_sec": round(recent, 2),
+            "latency_ms": latency_percentiles(ordered),
+        }
+
+
+class SolveService:
+    """Servicio asíncrono que agrupa en lotes las peticiones concurrentes y las resuelve sobre un pool de procesos ya iniciado.
+
+    Cada petición se encola; un único despachador toma la primera en cuanto hay un lugar libre en el pool y espera hasta `max_delay`
+    segundos (o hasta juntar `max_batch`) para sumar las que lleguen mientras tanto. Con poca carga los lotes son de una petición y la
+    latencia apenas aumenta; con mucha, las peticiones se acumulan mientras el pool está ocupado y los lotes crecen solos, amortizando el
+    costo de comunicación entre procesos. Se mantienen a lo sumo `2 * workers` lotes en vuelo.
+
+    Cada petición tiene un plazo: las que lo superan en la cola se responden como `"timeout"` sin llegar al pool, y las que llegan se
+    resuelven con el tiempo que les queda al empezar su búsqueda como límite (ver `_run_batch`), de modo que un lote nunca ocupa el pool más
+    allá del plazo de sus peticiones.
+    """
+
+    def __init__(self, workers: int = None, max_batch: int = 64, max_delay: float = 0.002, timeout: float = 10.0,
+                 algorithm: type = SudokuSolver, executor: Executor = None):
+        """Constructor
+
+        Args:
+            workers (int, optional): cantidad de procesos del pool. Defaults to None. Por defecto se usa `os.cpu_count()`.
+            max_batch (int, optional): peticiones máximas por lote. Defaults to 64.
+            max_delay (float, optional): segundos máximos que el despachador espera para completar un lote. Defaults to 0.002.
+            timeout (float, optional): plazo por defecto de cada petición, en segundos. Defaults to 10.0.
+            algorithm (type, optional): clase resolutora con el contrato de `Tester.algorithm`. Debe poder importarse desde los procesos del
+                pool. Defaults to SudokuSolver.
+            executor (Executor, optional): pool ya creado (y que no se cerrará) sobre el que resolver los lotes. Defaults to None.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.algorithm = algorithm
+        self.executor = executor
+        self.metrics = ServiceMetrics()
+        self._own_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batches = set()
+        self._next_index = 0
+
+    async def start(self) -> None:
+        """Método que crea el pool (si no se dio uno), lo precalienta en cada proceso e inicia el despachador."""
+        loop = asyncio.get_running_loop()
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm, self.algorithm) for _ in range(self.workers)))
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(2 * self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self) -> None:
+        """Método que detiene el despachador, espera los lotes en vuelo y cierra el pool si lo creó el servicio."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def __aenter__(self) -> "SolveService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def solve(self, puzzle: str, timeout: float = None) -> BatchResult:
+        """Método que resuelve un tablero.
+
+        Args:
+            puzzle (str): tablero como cadena de un carácter por celda.
+            timeout (float, optional): plazo de la petición en segundos, contando la espera en la cola. Defaults to None. Por defecto se usa el
+                del servicio.
+
+        Raises:
+            RuntimeError: Ocurre si el servicio no fue iniciado con `start`.
+
+        Returns:
+            BatchResult: resultado del tablero; `elapsed` es la latencia total de la petición.
+        """
+        return await self._submit(puzzle, None, timeout)
+
+    async def count(self, puzzle: str, limit: int = 2, timeout: float = None) -> BatchResult:
+        """Método que cuenta las soluciones de un tablero, hasta `limit` (ver `batch.count_one`).
+
+        Args:
+            puzzle (str): tablero como cadena de un carácter por celda.
+            limit (int, optional): cantidad de soluciones a partir de la cual se deja de buscar. Defaults to 2.
+            timeout (float, optional): plazo de la petición en segundos. Defaults to None. Por defecto se usa el del servicio.
+
+        Raises:
+            RuntimeError: Ocurre si el servicio no fue iniciado con `start`.
+
+        Returns:
+            BatchResult: resultado del tablero, con la cantidad de soluciones en `solutions`.
+        """
+        return await self._submit(puzzle, max(1, limit), timeout)
+
+    async def _submit(self, puzzle: str, limit: Optional[int], timeout: Optional[float]) -> BatchResult:
+        """Encola una petición y espera su resultado, como mucho hasta su plazo."""
+        if self._dispatcher is None:
+            raise RuntimeError("El servicio no está iniciado.")
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        index = self._next_index
+        self._next_index += 1
+        self.metrics.requests += 1
+        request = _Request(index, puzzle, limit, loop.time() + timeout, loop.create_future())
+        self._queue.put_nowait(request)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(request.future), timeout)
+        except asyncio.TimeoutError:
+            result = BatchResult(index, puzzle, None, "timeout", 0.0)
+        result.elapsed = time.perf_counter() - start
+        self.metrics.record(result.status, result.elapsed)
+        return result
+
+    async def _dispatch(self) -> None:
+        """Arma lotes con las peticiones encoladas a medida que se liberan lugares en el pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            closes = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = closes - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: List[_Request]) -> None:
+        """Envía un lote al pool, descartando las peticiones cuyo plazo ya venció, y entrega cada resultado a su petición."""
+        loop = asyncio.get_running_loop()
+        try:
+            now = loop.time()
+            live = []
+            for request in batch:
+                if request.deadline <= now or request.future.done():
+                    if not request.future.done():
+                        request.future.set_result(BatchResult(request.index, request.puzzle, None, "timeout", 0.0))
+                else:
+                    live.append(request)
+            if not live:
+                return
+            self.metrics.record_batch(len(live))
+            wall_clock = time.time() - now
+            items = [(request.index, request.puzzle, request.limit, request.deadline + wall_clock) for request in live]
+            results = await loop.run_in_executor(self.executor, _run_batch, items, self.algorithm)
+            for request, result in zip(live, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+        except Exception as error:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(error)
+        finally:
+            self._slots.release()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende una conexión HTTP/1.1 (con keep-alive) de `serve`.
+
+        Rutas:
+            `POST /solve`: cuerpo JSON `{"puzzle": str, "timeout": float}` o `{"puzzles": [str, ...], "timeout": float}`; responde el
+                resultado (o la lista de resultados) con los campos de `BatchResult`.
+            `POST /count`: igual que `/solve`, con un campo opcional `"limit"` (2 por defecto).
+            `GET /metrics`: métricas de `ServiceMetrics.snapshot`.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "Cuerpo demasiado grande."}
+                else:
+                    status, payload = await self._route(method, path.split("?", 1)[0], await reader.readexactly(length))
+                body = json.dumps(payload).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+                await writer.drain()
+                if status == 413 or headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        """Atiende una petición HTTP ya leída. Retorna el código de estado y el cuerpo de la respuesta."""
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "Se esperaba GET."}
+            return 200, self.metrics.snapshot(self._queue.qsize(), len(self._batches))
+        if path not in ("/solve", "/count"):
+            return 404, {"error": f"Ruta desconocida: {path}"}
+        if method != "POST":
+            return 405, {"error": "Se esperaba POST."}
+
+        try:
+            request = json.loads(body or b"{}")
+            timeout = request.get("timeout")
+            timeout = None if timeout is None else float(timeout)
+            limit = int(request.get("limit", 2))
+            puzzles = request["puzzles"] if "puzzles" in request else [request["puzzle"]]
+            if not all(isinstance(puzzle, str) for puzzle in puzzles):
+                raise TypeError
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return 400, {"error": "Se esperaba un JSON con 'puzzle' (cadena) o 'puzzles' (lista de cadenas)."}
+
+        if path == "/solve":
+            results = await asyncio.gather(*(self.solve(puzzle, timeout) for puzzle in puzzles))
+        else:
+            results = await asyncio.gather(*(self.count(puzzle, limit, timeout) for puzzle in puzzles))
+        results = [asdict(result) for result in results]
+        return 200, results if "puzzles" in request else results[0]
+
+
+async def serve(service: SolveService, host: str = "127.0.0.1", port: int = 8765, path: str = None) -> asyncio.AbstractServer:
+    """Función que inicia el servicio y lo expone por HTTP, en un puerto TCP o en un socket Unix.
+
+    Args:
+        service (SolveService): servicio a exponer. Se inicia con `start` si aún no lo estaba.
+        host (str, optional): dirección TCP. Defaults to "127.0.0.1".
+        port (int, optional): puerto TCP (0 elige uno libre). Defaults to 8765.
+        path (str, optional): ruta de un socket Unix; si se indica, se usa en lugar de `host` y `port`. Defaults to None.
+
+    Returns:
+        asyncio.AbstractServer: servidor ya escuchando.
+    """
+    if service._dispatcher is None:
+        await service.start()
+    if path is not None:
+        return await asyncio.start_unix_server(service.handle, path=path)
+    return await asyncio.start_server(service.handle, host, port)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Inicia el servicio con las opciones de la línea de comandos y lo mantiene hasta que se interrumpa."""
+    async with SolveService(args.workers, args.max_batch, args.max_delay / 1000, args.timeout) as service:
+        server = await serve(service, args.host, args.port, args.unix)
+        address = args.unix or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Servicio escuchando en {address} con {service.workers} procesos", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: List[str] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servicio local de resolución de sudokus.")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección TCP")
+    parser.add_argument("--port", type=int, default=8765, help="puerto TCP")
+    parser.add_argument("--unix", help="ruta de un socket Unix (en lugar de TCP)")
+    parser.add_argument("--workers", type=int, help="cantidad de procesos")
+    parser.add_argument("--max-batch", type=int, default=64, help="peticiones máximas por lote")
+    parser.add_argument("--max-delay", type=float, default=2.0, help="milisegundos máximos de espera para completar un lote")
+    parser.add_argument("--timeout", type=float, default=10.0, help="plazo por defecto de cada petición, en segundos")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
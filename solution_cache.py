@@ -0,0 +1,284 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice, permutations, product
+from typing import Iterator, List, Optional, Tuple
+
+from puzzle_io import PuzzleRecord, normalize_puzzle, read_puzzles, write_puzzles
+from sudoku import SudokuBoard, SudokuSolver, SudokuValidator
+
+DIGITS = "123456789"
+
+CANDIDATE_LIMIT = 256
+"""Máximo de transformaciones empatadas que `canonicalize` compara antes de quedarse con la mejor encontrada."""
+
+
+@dataclass(frozen=True)
+class Transform:
+    """Simetría del sudoku que lleva un tablero a su forma canónica.
+
+    Args:
+        transpose (bool): si es True se intercambian filas y columnas antes de permutarlas.
+        rows (Tuple[int, ...]): fila de origen de cada fila canónica. Respeta las bandas (solo mueve bandas enteras y filas dentro de su banda).
+        cols (Tuple[int, ...]): columna de origen de cada columna canónica. Respeta las pilas de subgrillas.
+        digits (str): valor canónico de cada dígito original (`digits[v - 1]` es el nuevo valor de `v`).
+    """
+    transpose: bool
+    rows: Tuple[int, ...]
+    cols: Tuple[int, ...]
+    digits: str
+
+    @property
+    def sources(self) -> List[int]:
+        """List[int]: celda del tablero original de la que proviene cada celda canónica."""
+        if self.transpose:
+            return [col * 9 + row for row in self.rows for col in self.cols]
+        return [row * 9 + col for row in self.rows for col in self.cols]
+
+    def apply(self, grid: str) -> str:
+        """Método que lleva un tablero (o su solución) del espacio original al canónico.
+
+        Args:
+            grid (str): tablero como cadena de 81 dígitos.
+
+        Returns:
+            str: tablero transformado.
+        """
+        return "".join(grid[source] for source in self.sources).translate(str.maketrans(DIGITS, self.digits))
+
+    def invert(self, grid: str) -> str:
+        """Método que lleva un tablero (o su solución) del espacio canónico al original.
+
+        Args:
+            grid (str): tablero canónico como cadena de 81 dígitos.
+
+        Returns:
+            str: tablero en el espacio original.
+        """
+        cells = [""] * 81
+        for cell, source in zip(grid, self.sources):
+            cells[source] = cell
+        return "".join(cells).translate(str.maketrans(self.digits, DIGITS))
+
+
+def canonicalize(puzzle: str, limit: int = CANDIDATE_LIMIT) -> Tuple[str, Transform]:
+    """Función que calcula la forma canónica de un tablero bajo las simetrías del sudoku.
+
+    Las simetrías consideradas son la transposición, las permutaciones de bandas y de pilas, las de filas y columnas dentro de cada banda o
+    pila, y el reetiquetado de los dígitos. Las filas y columnas se ordenan por invariantes que ninguna simetría altera (pistas por línea, pistas
+    de las líneas que cruzan y frecuencia de sus dígitos); entre las transformaciones que empatan se elige la que produce la menor cadena,
+    con los dígitos reetiquetados por orden de aparición. Así, dos tableros equivalentes obtienen la misma forma canónica, salvo que los empates
+    superen `limit` transformaciones (tableros muy simétricos o casi vacíos), en cuyo caso la forma sigue siendo válida pero puede diferir.
+
+    Args:
+        puzzle (str): tablero como cadena de 81 caracteres (`0` o `.` para las celdas vacías).
+        limit (int, optional): máximo de transformaciones empatadas a comparar. Defaults to CANDIDATE_LIMIT.
+
+    Raises:
+        ValueError: Ocurre si el tablero no tiene 81 caracteres válidos.
+
+    Returns:
+        Tuple[str, Transform]: forma canónica y transformación que lleva el tablero a ella.
+    """
+    puzzle = normalize_puzzle(puzzle)
+    if len(puzzle) != 81 or not puzzle.isdigit():
+        raise ValueError("El tablero debe tener 81 dígitos o '.'.")
+
+    best = None
+    for transpose, rows, cols in islice(_candidates(puzzle), limit):
+        transform = Transform(transpose, rows, cols, DIGITS)
+        permuted = "".join(puzzle[source] for source in transform.sources)
+        order = list(dict.fromkeys(permuted.replace("0", "")))
+        order += [digit for digit in DIGITS if digit not in order]
+        labels = [""] * 9
+        for label, digit in zip(DIGITS, order):
+            labels[int(digit) - 1] = label
+        text = permuted.translate(str.maketrans(DIGITS, "".join(labels)))
+        if best is None or text < best[0]:
+            best = (text, Transform(transpose, rows, cols, "".join(labels)))
+    return best
+
+
+def _candidates(puzzle: str) -> Iterator[Tuple[bool, Tuple[int, ...], Tuple[int, ...]]]:
+    """Genera las transformaciones (sin reetiquetado) que ordenan filas y columnas por sus invariantes."""
+    clues = [index for index in range(81) if puzzle[index] != "0"]
+    row_count, col_count, frequency = [0] * 9, [0] * 9, {}
+    for index in clues:
+        row_count[index // 9] += 1
+        col_count[index % 9] += 1
+        frequency[puzzle[index]] = frequency.get(puzzle[index], 0) + 1
+
+    row_keys = [[row_count[line]] for line in range(9)]
+    col_keys = [[col_count[line]] for line in range(9)]
+    for line in range(9):
+        cells = [index for index in clues if index // 9 == line]
+        row_keys[line] += [tuple(sorted(col_count[index % 9] for index in cells)), tuple(sorted(frequency[puzzle[index]] for index in cells))]
+        cells = [index for index in clues if index % 9 == line]
+        col_keys[line] += [tuple(sorted(row_count[index // 9] for index in cells)), tuple(sorted(frequency[puzzle[index]] for index in cells))]
+
+    row_signature, col_signature = _signature(row_keys), _signature(col_keys)
+    orientations = []
+    if (row_signature, col_signature) <= (col_signature, row_signature):
+        orientations.append((False, row_keys, col_keys))
+    if (col_signature, row_signature) <= (row_signature, col_signature):
+        orientations.append((True, col_keys, row_keys))
+    for transpose, first, second in orientations:
+        for rows, cols in product(_line_orders(first), _line_orders(second)):
+            yield transpose, rows, cols
+
+
+def _signature(keys: List) -> List:
+    """Resume las claves de las 9 líneas en una firma independiente de su orden."""
+    return sorted(sorted(keys[3 * band:3 * band + 3]) for band in range(3))
+
+
+def _line_orders(keys: List) -> List[Tuple[int, ...]]:
+    """Lista los órdenes de 9 líneas que dejan bandas y líneas ordenadas por clave, moviendo solo bandas enteras y líneas dentro de su banda."""
+    bands = []
+    for band in range(3):
+        lines = range(3 * band, 3 * band + 3)
+        target = sorted(keys[line] for line in lines)
+        bands.append((target, [order for order in permutations(lines) if [keys[line] for line in order] == target]))
+    target = sorted(key for key, _ in bands)
+    orders = []
+    for band_order in permutations(bands):
+        if [key for key, _ in band_order] == target:
+            for lines in product(*(choices for _, choices in band_order)):
+                orders.append(sum(lines, ()))
+    return list(dict.fromkeys(orders))
+
+
+class SolutionCache:
+    """Caché LRU de soluciones indexada por la forma canónica de los tableros.
+
+    Los tableros equivalentes (con los dígitos reetiquetados, transpuestos o con bandas, pilas, filas o columnas permutadas) comparten una
+    entrada: se guarda la solución de la forma canónica y se lleva de vuelta al tablero consultado con la transformación inversa. Las consultas
+    repetidas de un mismo tablero se resuelven antes de canonicalizar, con un diccionario de cadenas exactas.
+    """
+
+    def __init__(self, maxsize: int = 4096, path: str = None):
+        """Constructor
+
+        Args:
+            maxsize (int, optional): máximo de formas canónicas (y de tableros exactos) guardados; se descartan las menos usadas. Defaults to 4096.
+            path (str, optional): archivo donde persistir la caché con `save`. Si existe, se carga al construirla. Defaults to None.
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._canonical = OrderedDict()
+        self._exact = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def get(self, puzzle: str) -> Optional[str]:
+        """Método que busca la solución de un tablero.
+
+        Args:
+            puzzle (str): tablero como cadena de 81 caracteres.
+
+        Returns:
+            Optional[str]: solución como cadena de 81 dígitos, o None si ni el tablero ni uno equivalente están en la caché.
+        """
+        puzzle = normalize_puzzle(puzzle)
+        solution = self._exact.get(puzzle)
+        if solution is not None:
+            self._exact.move_to_end(puzzle)
+            self.hits += 1
+            return solution
+        return self._lookup(puzzle, *canonicalize(puzzle))
+
+    def put(self, puzzle: str, solution: str) -> None:
+        """Método que guarda la solución de un tablero.
+
+        Args:
+            puzzle (str): tablero como cadena de 81 caracteres.
+            solution (str): solución como cadena de 81 dígitos.
+        """
+        puzzle = normalize_puzzle(puzzle)
+        canonical, transform = canonicalize(puzzle)
+        self._store(puzzle, solution, canonical, transform)
+
+    def solve(self, puzzle: str, algorithm: type = SudokuSolver) -> Optional[str]:
+        """Método que retorna la solución de un tablero desde la caché o, si no está, resolviéndolo y guardando el resultado.
+
+        Args:
+            puzzle (str): tablero como cadena de 81 caracteres.
+            algorithm (type, optional): clase resolutora con el contrato de `Tester.algorithm`. Defaults to SudokuSolver.
+
+        Raises:
+            RuntimeError: Ocurre si el tablero viola alguna restricción.
+
+        Returns:
+            Optional[str]: solución como cadena de 81 dígitos, o None si el resolutor no la encontró.
+        """
+        puzzle = normalize_puzzle(puzzle)
+        solution = self._exact.get(puzzle)
+        if solution is not None:
+            self._exact.move_to_end(puzzle)
+            self.hits += 1
+            return solution
+
+        canonical, transform = canonicalize(puzzle)
+        solution = self._lookup(puzzle, canonical, transform)
+        if solution is None:
+            solver = algorithm(SudokuBoard(puzzle))
+            if solver.solve() and SudokuValidator.validate(solver.board):
+                solution = solver.board.to_string()
+                self._store(puzzle, solution, canonical, transform)
+        return solution
+
+    def save(self, path: str = None) -> int:
+        """Método que persiste las formas canónicas y sus soluciones, una línea por entrada (`forma solución`) y de la menos a la más usada.
+
+        Args:
+            path (str, optional): archivo de destino (se comprime con gzip si termina en `.gz`). Defaults to None. Por defecto se usa `path`.
+
+        Returns:
+            int: cantidad de entradas escritas.
+        """
+        return write_puzzles(path or self.path, (PuzzleRecord(canonical, solution) for canonical, solution in self._canonical.items()))
+
+    def load(self, path: str = None) -> int:
+        """Método que agrega a la caché las entradas de un archivo escrito con `save`.
+
+        Args:
+            path (str, optional): archivo de origen. Defaults to None. Por defecto se usa `path`.
+
+        Returns:
+            int: cantidad de entradas leídas.
+        """
+        count = 0
+        for record in read_puzzles(path or self.path):
+            if record.code:
+                self._remember(self._canonical, record.puzzle, record.code)
+                count += 1
+        return count
+
+    def _lookup(self, puzzle: str, canonical: str, transform: Transform) -> Optional[str]:
+        """Busca la forma canónica y, si está, retorna la solución llevada al espacio del tablero."""
+        solution = self._canonical.get(canonical)
+        if solution is None:
+            self.misses += 1
+            return None
+        self._canonical.move_to_end(canonical)
+        self.hits += 1
+        solution = transform.invert(solution)
+        self._remember(self._exact, puzzle, solution)
+        return solution
+
+    def _store(self, puzzle: str, solution: str, canonical: str, transform: Transform) -> None:
+        """Guarda la solución bajo la forma canónica y bajo la cadena exacta del tablero."""
+        self._remember(self._canonical, canonical, transform.apply(solution))
+        self._remember(self._exact, puzzle, solution)
+
+    def _remember(self, entries: OrderedDict, key: str, value: str) -> None:
+        """Inserta una entrada como la más reciente y descarta la menos usada si se supera `maxsize`."""
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
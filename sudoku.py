@@ -1,21 +1,261 @@
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import Tuple, List
+from functools import lru_cache
+from itertools import combinations
+from operator import itemgetter
+from typing import Dict, Optional, Tuple, List
+
+SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+"""Símbolos de los valores en las cadenas de tableros: `SYMBOLS[v - 1]` representa al valor `v` (las letras también se aceptan en
+minúscula). Las celdas vacías se representan con `0` o `.`."""
+
+BOX_SIZES = (2, 3, 4, 5)
+"""Tamaños de subcuadrícula admitidos: tableros de 4x4, 9x9, 16x16 y 25x25."""
+
+
+class BitCount:
+    """Conteo de bits de cada máscara calculado con `int.bit_count`. Reemplaza a la tabla completa en los tableros de 25x25, en los que
+    ocuparía 32 MiB en cada proceso."""
+    __slots__ = ()
+
+    def __getitem__(self, mask: int) -> int:
+        return mask.bit_count()
+
+
+class MaskValues:
+    """Tabla de los valores (ordenados) contenidos en cada máscara, que guarda solo las `maxsize` máscaras consultadas más recientemente. Se
+    usa en los tableros en los que una tabla completa tendría demasiadas entradas, sin que crezca sin límite en procesos de larga duración.
+    """
+    __slots__ = ("_values",)
+
+    def __init__(self, maxsize: int = 4096):
+        self._values = lru_cache(maxsize=maxsize)(_mask_values)
+
+    def __getitem__(self, mask: int) -> Tuple[int, ...]:
+        return self._values(mask)
+
+
+def _mask_values(mask: int) -> Tuple[int, ...]:
+    """Valores contenidos en una máscara, de menor a mayor."""
+    return tuple(value for value in range(1, mask.bit_length() + 1) if mask >> (value - 1) & 1)
+
+
+class Geometry:
+    """Tablas precalculadas de un tablero de `box_size ** 2` x `box_size ** 2` celdas. Se obtienen con `geometry(box_size)`, que las calcula
+    una sola vez por tamaño y las comparte entre todos los tableros.
+
+    Args:
+        box_size (int): lado de las subcuadrículas; el tablero tiene `size = box_size ** 2` filas, columnas, subcuadrículas y valores.
+
+    Las celdas se numeran fila por fila (`fila * size + columna`) y las unidades son las filas (`0` a `size - 1`), las columnas (`size` a
+    `2 * size - 1`) y las subcuadrículas (`2 * size` a `3 * size - 1`). Los dominios son máscaras de `size` bits (el bit `v - 1` indica que el
+    valor `v` es posible), guardadas en arreglos de 16 bits (`typecode "H"`) hasta 16x16 y de 32 bits (`"L"`) en 25x25.
+    """
+
+    def __init__(self, box_size: int):
+        if box_size not in BOX_SIZES:
+            raise ValueError(f"Tamaño de subcuadrícula no admitido: {box_size}. Se admiten {BOX_SIZES}.")
+        size = box_size * box_size
+        self.box_size = box_size
+        self.size = size
+        self.cells = size * size
+        self.unit_count = 3 * size
+        self.full_mask = (1 << size) - 1
+        self.typecode = "H" if size <= 16 else "L"
+        self.index_typecode = "B" if self.cells <= 256 else "H"
+        self.symbols = SYMBOLS[:size]
+        self.symbol_value = {symbol: value for value, symbol in enumerate(self.symbols, 1)}
+        self.symbol_value.update({symbol.lower(): value for symbol, value in list(self.symbol_value.items())})
+        self.symbol_value.update({"0": 0, ".": 0})
+
+        if size <= 16:
+            self.bit_count = [0]
+            for _ in range(size):
+                self.bit_count += [count + 1 for count in self.bit_count]
+        else:
+            self.bit_count = BitCount()
+        if size <= 9:
+            self.mask_values = [tuple(value for value in range(1, size + 1) if mask >> (value - 1) & 1) for mask in range(self.full_mask + 1)]
+        else:
+            self.mask_values = MaskValues()
+
+        cells = range(self.cells)
+        self.row_of = [index // size for index in cells]
+        self.col_of = [index % size for index in cells]
+        self.box_of = [box_size * (index // (size * box_size)) + (index % size) // box_size for index in cells]
+        self.column_major = [row * size + col for col in range(size) for row in range(size)]
+        self.column_rank = [0] * self.cells
+        for rank, index in enumerate(self.column_major):
+            self.column_rank[index] = rank
+        self.units = ([[row * size + col for col in range(size)] for row in range(size)] +
+                      [[row * size + col for row in range(size)] for col in range(size)] +
+                      [[(start_row + i) * size + start_col + j for i in range(box_size) for j in range(box_size)]
+                       for start_row in range(0, size, box_size) for start_col in range(0, size, box_size)])
+        self.cell_units = [(self.row_of[index], size + self.col_of[index], 2 * size + self.box_of[index]) for index in cells]
+        self.unit_getters = [itemgetter(*unit) for unit in self.units]
+        self.peers = [tuple(sorted({other for unit in self.cell_units[index] for other in self.units[unit]} - {index})) for index in cells]
+
+    @staticmethod
+    def for_cells(cells: int) -> "Geometry":
+        """Método que obtiene la geometría de un tablero a partir de su cantidad de celdas.
+
+        Raises:
+            ValueError: Ocurre si ningún tamaño admitido tiene esa cantidad de celdas.
+        """
+        for box_size in BOX_SIZES:
+            if box_size ** 4 == cells:
+                return geometry(box_size)
+        raise ValueError(f"Se esperaban {', '.join(str(box_size ** 4) for box_size in BOX_SIZES)} celdas y se recibieron {cells}.")
+
+
+@lru_cache(maxsize=None)
+def geometry(box_size: int = 3) -> Geometry:
+    """Función que obtiene (y calcula la primera vez) las tablas de un tamaño de tablero.
+
+    Args:
+        box_size (int, optional): lado de las subcuadrículas, uno de `BOX_SIZES`. Defaults to 3.
+
+    Raises:
+        ValueError: Ocurre si el tamaño no está admitido.
+
+    Returns:
+        Geometry: tablas del tamaño dado.
+    """
+    return Geometry(box_size)
+
+
+STANDARD = geometry(3)
+"""Geometría del tablero clásico de 9x9. Las constantes siguientes son sus tablas, que el resto de los módulos usan directamente."""
+
+FULL_MASK = STANDARD.full_mask
+"""Máscara con los 9 valores posibles de una celda (bit `v - 1` representa al valor `v`)."""
+
+BIT_COUNT = STANDARD.bit_count
+"""Cantidad de valores contenidos en cada máscara posible."""
+
+MASK_VALUES = STANDARD.mask_values
+"""Valores (ordenados) contenidos en cada máscara posible."""
+
+ROW_OF = STANDARD.row_of
+COL_OF = STANDARD.col_of
+BOX_OF = STANDARD.box_of
+
+COLUMN_MAJOR = STANDARD.column_major
+"""Índices de las celdas en el orden en el que el resolutor las recorre (columna por columna)."""
+
+COLUMN_RANK = STANDARD.column_rank
+"""Posición de cada celda dentro de `COLUMN_MAJOR`."""
+
+UNITS = STANDARD.units
+"""Las 27 unidades del tablero como listas de índices: filas (0-8), columnas (9-17) y subcuadrículas (18-26)."""
+
+CELL_UNITS = STANDARD.cell_units
+"""Unidades a las que pertenece cada celda."""
+
+UNIT_GETTERS = STANDARD.unit_getters
+"""Funciones que extraen de una lista de 81 valores los de cada unidad."""
+
+PEERS = STANDARD.peers
+"""Las 20 celdas que comparten fila, columna o subcuadrícula con cada celda."""
+
+
+def values_to_mask(values) -> int:
+    """Convierte una colección de valores en su máscara de bits.
+
+    Args:
+        values (Iterable[int]): valores desde 1.
+
+    Returns:
+        int: máscara con un bit encendido por cada valor.
+    """
+    mask = 0
+    for value in values:
+        mask |= 1 << (value - 1)
+    return mask
+
 
 @dataclass
+class SolverStats:
+    """Estadísticas de una resolución.
+
+    Args:
+        assignments (int): asignaciones intentadas (nodos del árbol de búsqueda).
+        backtracks (int): asignaciones deshechas, ya sea por conflicto inmediato o porque la búsqueda bajo ellas falló.
+        backjumps (int): veces que la búsqueda se retiró de una celda tras agotar sus valores.
+        total_backjump_distance (int): suma de los niveles retrocedidos en cada retirada.
+        max_backjump (int): mayor cantidad de niveles retrocedidos en una sola retirada.
+        max_depth (int): mayor profundidad alcanzada por la búsqueda.
+        propagation_time (float): segundos dedicados a asignar y propagar restricciones.
+        search_time (float): segundos dedicados al resto de la búsqueda (selección de celdas y valores, retrocesos).
+        eliminations (Dict[str, int]): candidatos eliminados por cada regla de inferencia del tablero.
+    """
+    assignments: int = 0
+    backtracks: int = 0
+    backjumps: int = 0
+    total_backjump_distance: int = 0
+    max_backjump: int = 0
+    max_depth: int = 0
+    propagation_time: float = 0.0
+    search_time: float = 0.0
+    eliminations: Dict[str, int] = field(default_factory=dict)
+
+
+class PrintTracer:
+    """Trazador que imprime cada evento en pantalla. Es el que se usa con `verbose=True`.
+
+    Un trazador es cualquier función (u objeto invocable) con la firma `tracer(event: str, **data)`. El tablero emite los eventos `place`
+    (cell, value) y `eliminate` (rule, cell, values), y los resolutores `assign` (cell, value, depth), `conflict` (cell, value, cells),
+    `backtrack` (cell, value, depth), `exhausted` (cell, depth, distance), `solution` (depth) y `unsolvable`. Cuando no hay un trazador
+    asignado (None) los ciclos internos no construyen ni emiten eventos.
+    """
+
+    MESSAGES = {
+        "place": "Propagando desde {cell}: valor {value}",
+        "eliminate": "Aplicando {rule}, eliminando {values} de {cell}",
+        "assign": "Intentando asignar {value} a la celda {cell}",
+        "conflict": "Conflicto detectado en {cell} con {cells}. Se descarta el valor {value}.",
+        "backtrack": "Deshaciendo la asignación de {value} en la celda {cell}.",
+        "exhausted": "No se encontró solución al intentar asignar valores a la celda {cell}. Retrocediendo {distance} nivel(es).",
+        "solution": "El tablero ha sido resuelto exitosamente.",
+        "unsolvable": "Se ha detectado un conflicto que no puede ser resuelto.",
+    }
+
+    def __call__(self, event: str, **data) -> None:
+        message = self.MESSAGES.get(event)
+        print(message.format(**data) if message else f"{event}: {data}")
+
+
 class Var:
-    """Esta clase contiene la estructura y funcionalidad básica para una variable del tablero de sudoku.
-    
+    """Esta clase representa una variable del tablero de sudoku. Es una vista ligera sobre la máscara de candidatos que el tablero almacena para la celda, por lo que cualquier cambio hecho a través de ella se refleja en el tablero (y queda registrado en su bitácora de deshacer).
+
     Args:
-        location (Tuple[int, int]): coordenadas de la variable en el tablero de sudoku.
-        domain (List[int]): dominio (a.k.a posibles valores) de la variable.
-        previous_domains (List[List[int]], optional): historial de todos los dominios que ha tenido la variable. Este campo normalmente no es requerido y simplemente sirve para uso interno del resolutor.
+        board (SudokuBoard): tablero al que pertenece la variable.
+        index (int): posición de la variable en el arreglo plano del tablero (`fila * size + columna`).
     """
-    location: Tuple[int,  int]
-    domain: List[int]
-    previous_domains: List[List[int]] = field(default_factory=list)
-    
+    __slots__ = ("board", "index")
+
+    def __init__(self, board: "SudokuBoard", index: int):
+        self.board = board
+        self.index = index
+
+    @property
+    def location(self) -> Tuple[int, int]:
+        """Tuple[int, int]: coordenadas de la variable en el tablero de sudoku."""
+        geometry = self.board.geometry
+        return geometry.row_of[self.index], geometry.col_of[self.index]
+
+    @property
+    def domain(self) -> List[int]:
+        """List[int]: dominio (a.k.a posibles valores) de la variable. Es una copia, modificarla no altera el tablero."""
+        return list(self.board.geometry.mask_values[self.board.masks[self.index]])
+
+    @domain.setter
+    def domain(self, domain: List[int]) -> None:
+        self.set_domain(domain)
+
     def assign_value(self, value: int) -> None:
-        """Método que permite asignar un valor a la variable.
+        """Método que permite asignar un valor a la variable. No propaga restricciones, para ello se debe usar `SudokuBoard.assign_value`.
 
         Args:
             value (int): valor a asignar a la variable.
@@ -23,34 +263,32 @@ class Var:
         Raises:
             ValueError: Ocurre si el valor que se quiere asignar no está dentro del dominio de la variable.
         """
-        if value in self.domain:
-            self.previous_domains.append(self.domain[:])
-            self.domain = [value]
+        bit = 1 << (value - 1) if 1 <= value <= self.board.geometry.size else 0
+        if self.board.masks[self.index] & bit:
+            self.board._set_mask(self.index, bit)
         else:
             raise ValueError()
-        
+
     def reset_domain(self, failed_value: int = None) -> None:
-        """Método que permite reestablecer el dominio de la variable.
+        """Método que permite reestablecer el dominio de la variable al que tenía en el último punto de control del tablero (o al dominio completo si no hay puntos de control abiertos).
 
         Args:
             failed_value (int, optional): Valor que ha fallado y no será incluido en el nuevo dominio de la variable. Defaults to None.
         """
-        if self.previous_domains:
-            self.domain = self.previous_domains.pop()
-            if failed_value and failed_value in self.domain:
-                self.domain.remove(failed_value)
-        else:
-            self.previous_domains.append(self.domain[:])
-            self.domain = list(range(1,10))
-            
+        mask = self.board._checkpoint_mask(self.index)
+        if failed_value:
+            mask &= ~(1 << (failed_value - 1))
+        self.board._set_mask(self.index, mask)
+        self.board._stale = True
+
     def is_assigned(self) -> bool:
         """Método que retorna si la variable esta o no asignada. Una variable se considera asignada cuando su dominio es de longitud 1.
 
         Returns:
             bool: True si la variable esta asignada, False en caso contrario.
         """
-        return True if len(self.domain) == 1 else False
-    
+        return self.board.geometry.bit_count[self.board.masks[self.index]] == 1
+
     def get_value(self) -> int:
         """Método que permite obtener el valor asignado de una variable.
 
@@ -60,150 +298,711 @@ class Var:
         Returns:
             int: valor asignado a la variable.
         """
-        if not self.is_assigned():
+        mask = self.board.masks[self.index]
+        if self.board.geometry.bit_count[mask] != 1:
             raise RuntimeError()
-        
-        return self.domain[0]
-    
+
+        return mask.bit_length()
+
     def set_domain(self, domain: List[int]) -> None:
         """Método para establecer un dominio de manera precisa en una variable.
 
         Args:
             domain (List[int]): nuevo dominio.
         """
-        self.previous_domains.append(self.domain[:])
-        self.domain = domain
-        
+        self.board._set_mask(self.index, values_to_mask(domain))
+        self.board._stale = True
+
+
 class SudokuBoard:
-    """Clase que representa un tablero de Sudoku."""
-    
-    def __init__(self, initial_values: List[List[int]] = None, verbose: bool = False):
+    """Clase que representa un tablero de Sudoku.
+
+    El tablero guarda el dominio de cada celda como una máscara de bits en un arreglo plano (81 posiciones de 9 bits en el tablero clásico), y
+    mantiene las máscaras de valores ya usados por cada unidad (27 en el tablero clásico), de forma que eliminar candidatos se reduce a
+    operaciones de bits. Las tablas de celdas, unidades y pares dependen del tamaño del tablero y se comparten a través de `geometry`.
+
+    Mientras haya un punto de control abierto (`push_checkpoint`), cada modificación de una máscara se anota en una bitácora (`trail`) como el
+    par (posición, valor anterior), de forma que `rollback` deshace todo el trabajo de una asignación fallida en tiempo proporcional a los
+    cambios, sin copiar ni volver a recorrer el tablero. Las posiciones menores que `geometry.cells` corresponden a `masks`, las
+    `geometry.unit_count` siguientes a `used` y el resto a `reasons`.
+
+    `reasons` guarda, para cada celda, los niveles de decisión (la cantidad de puntos de control abiertos al asignar) que explican su dominio
+    actual, como una máscara con el bit `n` para el nivel `n`. Es una sobreaproximación segura: la celda asignada por una decisión recibe el
+    nivel de esa decisión, una eliminación en los pares hereda las razones de la celda que la provoca y las reglas de unidad usan la unión de
+    las razones de las celdas de la unidad. `SudokuSolver` la usa para saltar directamente al nivel culpable de un conflicto.
+
+    Las celdas no asignadas se mantienen en un conjunto disperso: las primeras `unassigned_count` posiciones de `unassigned` son sus índices.
+    Al asignarse una celda se intercambia con la última de esa zona, y al deshacer basta con restaurar el contador.
+
+    Además de eliminar el valor de cada celda asignada de sus pares, la propagación aplica las reglas de inferencia de `INFERENCE_RULES` cuyo
+    nivel no supere `inference_level`. Las reglas de unidad se aplican solo sobre las unidades cuyos dominios cambiaron; las globales, cuando
+    ya no queda nada más por propagar. `eliminations` acumula cuántos candidatos eliminó cada regla.
+    """
+
+    INFERENCE_RULES = [
+        (1, "naked_pairs", "_naked_pairs_in_unit", "unit"),
+        (2, "hidden_singles", "_hidden_singles_in_unit", "unit"),
+        (3, "pointing", "_pointing_in_unit", "unit"),
+        (3, "box_line", "_box_line_in_unit", "unit"),
+        (4, "naked_subsets", "_naked_subsets_in_unit", "unit"),
+        (4, "hidden_subsets", "_hidden_subsets_in_unit", "unit"),
+        (5, "x_wing", "_x_wing", "board"),
+    ]
+    """Reglas de inferencia disponibles como tuplas (nivel mínimo, nombre, método, alcance). Las reglas de alcance `"unit"` reciben el
+    índice de una unidad y las de alcance `"board"` no reciben argumentos; ambas retornan la lista de celdas cuyo dominio redujeron. Las
+    subclases pueden extender esta lista para añadir reglas propias."""
+
+    def __init__(self, initial_values: List[List[int]] = None, verbose: bool = False, inference_level: int = 2, tracer=None,
+                 box_size: int = None):
         """Constructor
 
         Args:
-            initial_values (List[List[int]], optional): valores con los que será construido el tablero. Defaults to None. Por defecto se creará un tablero vacío.
-            verbose (bool, optional): Si es True, se activará el modo verbose. Defaults to False.
+            initial_values (List[List[int]] | str, optional): valores con los que será construido el tablero, como matriz (9x9 en el tablero
+                clásico) o como cadena fila por fila con un carácter de `SYMBOLS` por celda (`0` o `.` en las celdas vacías), que se carga
+                directamente en las máscaras sin pasar por una matriz intermedia. Defaults to None. Por defecto se creará un tablero vacío.
+            verbose (bool, optional): Si es True, se activará el modo verbose (un `PrintTracer`). Defaults to False.
+            inference_level (int, optional): nivel de las reglas de inferencia a aplicar: 0 solo elimina valores de los pares, 1 añade pares
+                desnudos, 2 singles ocultos, 3 pares apuntadores y reducción caja/línea, 4 subconjuntos desnudos y ocultos de hasta 4 celdas y
+                5 X-wing. Defaults to 2.
+            tracer (Callable[..., None], optional): trazador que recibe los eventos de la propagación (ver `PrintTracer`). Defaults to None.
+            box_size (int, optional): lado de las subcuadrículas (2, 3, 4 o 5, para tableros de 4x4, 9x9, 16x16 o 25x25). Defaults to None.
+                Por defecto se deduce del tamaño de `initial_values`, o es 3 si no se dan valores.
+
+        Raises:
+            ValueError: Ocurre si la cadena dada no tiene la cantidad de caracteres de un tablero admitido o contiene caracteres inválidos.
+            RuntimeError: Ocurre si los valores iniciales violan alguna restricción.
         """
         self.verbose = verbose
-        initial_values = initial_values if initial_values else [[0 for _ in range(9)] for _ in range(9)]
-        self.grid = [[Var((row, col), [initial_values[row][col]] if initial_values[row][col] else list(range(1, 10))) for col in range(9)] for row in range(9)]
+        self.tracer = tracer if tracer is not None else (PrintTracer() if verbose else None)
+        if box_size is not None:
+            self.geometry = geometry(box_size)
+        elif isinstance(initial_values, str):
+            self.geometry = Geometry.for_cells(len(initial_values))
+        elif initial_values:
+            self.geometry = Geometry.for_cells(len(initial_values) ** 2)
+        else:
+            self.geometry = STANDARD
+        self.set_inference_level(inference_level)
+        geo = self.geometry
+        self.masks = array(geo.typecode, [geo.full_mask]) * geo.cells
+        self.used = array(geo.typecode, [0]) * geo.unit_count
+        self.unassigned = array(geo.index_typecode, range(geo.cells))
+        self.unassigned_count = geo.cells
+        self._unassigned_pos = array(geo.index_typecode, range(geo.cells))
+        self._rebuilds = 0
+        self.reasons: List[int] = [0] * geo.cells
+        self.trail: List[int] = []
+        self._checkpoints: List[Tuple[int, int, int]] = []
+        self._stale = False
+        if isinstance(initial_values, str):
+            self._load_string(initial_values)
+        elif initial_values:
+            for row in range(geo.size):
+                for col in range(geo.size):
+                    if initial_values[row][col]:
+                        self.masks[row * geo.size + col] = 1 << (initial_values[row][col] - 1)
         self.propagate_constraints()
-    
+
+    def _load_string(self, text: str) -> None:
+        """Carga una cadena de un carácter por celda en las máscaras del tablero."""
+        if len(text) != self.geometry.cells:
+            raise ValueError(f"Se esperaban {self.geometry.cells} caracteres y se recibieron {len(text)}.")
+        masks, symbol_value = self.masks, self.geometry.symbol_value
+        for index, char in enumerate(text):
+            value = symbol_value.get(char)
+            if value is None:
+                raise ValueError(f"Carácter inválido {char!r} en la posición {index}.")
+            if value:
+                masks[index] = 1 << (value - 1)
+
+    def set_inference_level(self, level: int) -> None:
+        """Método que selecciona las reglas de inferencia que aplicará la propagación.
+
+        Args:
+            level (int): nivel máximo de las reglas de `INFERENCE_RULES` que se aplicarán.
+        """
+        self.inference_level = level
+        self.eliminations: Dict[str, int] = {"peers": 0}
+        self.unit_rules = []
+        self.board_rules = []
+        for rule_level, name, method, scope in self.INFERENCE_RULES:
+            self.eliminations[name] = 0
+            if rule_level <= level:
+                rules = self.unit_rules if scope == "unit" else self.board_rules
+                rules.append(getattr(self, method))
+
     def var(self, row: int, col: int) -> Var:
-        """Método que devuelve el objeto Var almacenado en una posición dada.
+        """Método que devuelve la variable almacenada en una posición dada.
 
         Args:
             row (int): coordenada de fila.
             col (int): coordenada de columna.
 
         Returns:
-            Var: Objeto almacenado en las coordenadas dadas.
+            Var: Vista de la variable en las coordenadas dadas.
         """
+        size = self.geometry.size
+        if 0 <= row < size and 0 <= col < size:
+            return Var(self, row * size + col)
+        return None
+
+    def propagate_constraints(self, cells: List[Tuple[int, int]] = None) -> None:
+        """Método encargado de propagar las restricciones de fila, columna, subgrilla y pares.
+
+        La propagación usa una cola de trabajo al estilo AC-3: cada celda que queda asignada elimina su valor únicamente de sus pares (20 en el
+        tablero clásico), y solo se vuelven a aplicar las reglas de inferencia en las unidades cuyos dominios cambiaron.
+
+        Args:
+            cells (List[Tuple[int, int]], optional): celdas recién asignadas desde las que se debe propagar. Defaults to None. Por defecto se
+                recalculan los valores usados y se propaga desde todas las celdas asignadas del tablero.
+
+        Raises:
+            RuntimeError: Ocurre cuando dos celdas relacionadas terminan con el mismo valor asignado o alguna regla deja una celda o un valor sin
+                posibilidades.
+        """
+        geo = self.geometry
+        row_of, col_of, cell_units, peers, bit_count = geo.row_of, geo.col_of, geo.cell_units, geo.peers, geo.bit_count
+        if cells is None or self._stale:
+            queue = self._reset_used_masks()
+            dirty_units = set(range(geo.unit_count))
+        else:
+            queue = [row * geo.size + col for row, col in cells]
+            dirty_units = {unit for index in queue for unit in cell_units[index]}
+
+        masks, used, reasons, used_slot = self.masks, self.used, self.reasons, geo.cells
+        reason_slot = used_slot + geo.unit_count
+        trail = self.trail if self._checkpoints else None
+        unit_rules, board_rules = self.unit_rules, self.board_rules
+        tracer = self.tracer
+        eliminated = 0
         try:
-            return self.grid[row][col]
-        except IndexError:
-            return None
-        
-    def propagate_constraints(self) -> None:
-        """Método encargado de propagar de forma recursiva las restricciones de fila, columna, subgrilla y pares."""
-        changes = True
-        while changes:
-            changes = False
-            for row in range(9):
-                for col in range(9):
-                    if self.var(row, col).is_assigned():
-                        if self.remove_values(row, col, self.var(row, col).get_value()):
-                            changes = True
-                            if self.verbose:
-                                print(f"Propagando desde ({row}, {col}): valor {self.var(row, col).get_value()}")
-            if self.apply_naked_pairs():
-                changes = True
-                
+            while True:
+                while queue:
+                    index = queue.pop()
+                    mask = masks[index]
+                    units = cell_units[index]
+                    if (used[units[0]] | used[units[1]] | used[units[2]]) & mask:
+                        raise RuntimeError([(row_of[index], col_of[index]), self._find_duplicate(index)])
+                    for unit in units:
+                        if trail is not None:
+                            trail.append(used_slot + unit)
+                            trail.append(used[unit])
+                        used[unit] |= mask
+                    if tracer is not None:
+                        tracer("place", cell=(row_of[index], col_of[index]), value=mask.bit_length())
+
+                    reason = reasons[index]
+                    for peer in peers[index]:
+                        peer_mask = masks[peer]
+                        if peer_mask & mask:
+                            if peer_mask == mask:
+                                raise RuntimeError([(row_of[index], col_of[index]), (row_of[peer], col_of[peer])])
+                            if trail is not None:
+                                trail.append(peer)
+                                trail.append(peer_mask)
+                            peer_reason = reasons[peer]
+                            if peer_reason | reason != peer_reason:
+                                if trail is not None:
+                                    trail.append(reason_slot + peer)
+                                    trail.append(peer_reason)
+                                reasons[peer] = peer_reason | reason
+                            peer_mask &= ~mask
+                            masks[peer] = peer_mask
+                            eliminated += 1
+                            dirty_units.update(cell_units[peer])
+                            if bit_count[peer_mask] == 1:
+                                self._remove_unassigned(peer)
+                                queue.append(peer)
+                            if tracer is not None:
+                                tracer("eliminate", rule="peers", cell=(row_of[peer], col_of[peer]), values=[mask.bit_length()])
+
+                changed = None
+                if dirty_units:
+                    unit = dirty_units.pop()
+                    for rule in unit_rules:
+                        changed = rule(unit)
+                        if changed:
+                            break
+                elif board_rules:
+                    for rule in board_rules:
+                        changed = rule()
+                        if changed:
+                            break
+                    if not changed:
+                        break
+                else:
+                    break
+
+                if changed:
+                    for index in set(changed):
+                        dirty_units.update(cell_units[index])
+                        if bit_count[masks[index]] == 1:
+                            queue.append(index)
+        finally:
+            self.eliminations["peers"] += eliminated
+
+    def _reset_used_masks(self) -> List[int]:
+        """Vacía las máscaras de valores usados para que sean recalculadas a partir de todas las celdas asignadas.
+
+        Returns:
+            List[int]: índices de las celdas asignadas, listos para ser usados como cola de propagación.
+        """
+        for unit in range(self.geometry.unit_count):
+            self._set_used(unit, 0)
+        self._stale = False
+        self._rebuild_unassigned()
+        masks, bit_count = self.masks, self.geometry.bit_count
+        return [index for index in range(self.geometry.cells - 1, -1, -1) if bit_count[masks[index]] == 1]
+
+    def _rebuild_unassigned(self) -> None:
+        """Reconstruye el conjunto de celdas no asignadas a partir de las máscaras."""
+        self._rebuilds += 1
+        self.unassigned_count = 0
+        bit_count = self.geometry.bit_count
+        for index in range(self.geometry.cells):
+            if bit_count[self.masks[index]] != 1:
+                self.unassigned[self.unassigned_count] = index
+                self._unassigned_pos[index] = self.unassigned_count
+                self.unassigned_count += 1
+        position = self.unassigned_count
+        for index in range(self.geometry.cells):
+            if bit_count[self.masks[index]] == 1:
+                self.unassigned[position] = index
+                self._unassigned_pos[index] = position
+                position += 1
+
+    def _remove_unassigned(self, index: int) -> None:
+        """Saca una celda del conjunto de celdas no asignadas intercambiándola con la última de la zona activa."""
+        position = self._unassigned_pos[index]
+        last = self.unassigned_count - 1
+        if position > last:
+            return
+        other = self.unassigned[last]
+        self.unassigned[position] = other
+        self._unassigned_pos[other] = position
+        self.unassigned[last] = index
+        self._unassigned_pos[index] = last
+        self.unassigned_count = last
+
+    def _set_mask(self, index: int, mask: int) -> None:
+        """Reemplaza la máscara de una celda, anotando el valor anterior en la bitácora si hay un punto de control abierto."""
+        if self._checkpoints:
+            self.trail.append(index)
+            self.trail.append(self.masks[index])
+        self.masks[index] = mask
+        if self.geometry.bit_count[mask] == 1:
+            self._remove_unassigned(index)
+
+    def _set_used(self, unit: int, mask: int) -> None:
+        """Reemplaza la máscara de valores usados de una unidad, anotando el valor anterior en la bitácora si hay un punto de control abierto."""
+        if self._checkpoints:
+            self.trail.append(self.geometry.cells + unit)
+            self.trail.append(self.used[unit])
+        self.used[unit] = mask
+
+    def _set_reason(self, index: int, reason: int) -> None:
+        """Reemplaza las razones de una celda, anotando el valor anterior en la bitácora si hay un punto de control abierto."""
+        if self._checkpoints:
+            self.trail.append(self.geometry.cells + self.geometry.unit_count + index)
+            self.trail.append(self.reasons[index])
+        self.reasons[index] = reason
+
+    def _add_reason(self, index: int, reason: int) -> None:
+        """Agrega niveles a las razones de una celda."""
+        if self.reasons[index] | reason != self.reasons[index]:
+            self._set_reason(index, self.reasons[index] | reason)
+
+    def _unit_reason(self, *units: int) -> int:
+        """Retorna la unión de las razones de las celdas de las unidades dadas."""
+        reasons, reason = self.reasons, 0
+        for unit in units:
+            for index in self.geometry.units[unit]:
+                reason |= reasons[index]
+        return reason
+
+    def explain(self, cells: List[Tuple[int, int]]) -> int:
+        """Método que retorna los niveles de decisión que explican un conflicto.
+
+        Args:
+            cells (List[Tuple[int, int]]): celdas de un conflicto, como las que acompañan al `RuntimeError` de la propagación.
+
+        Returns:
+            int: máscara con el bit `n` encendido para cada nivel `n` que contribuyó al conflicto (0 si no depende de ninguna decisión).
+        """
+        size, reasons, reason = self.geometry.size, self.reasons, 0
+        for row, col in cells:
+            reason |= reasons[row * size + col]
+        return reason
+
+    def _checkpoint_mask(self, index: int) -> int:
+        """Obtiene la máscara que tenía una celda al abrirse el último punto de control (o el dominio completo si no hay puntos de control)."""
+        if not self._checkpoints:
+            return self.geometry.full_mask
+        trail = self.trail
+        for position in range(self._checkpoints[-1][0], len(trail), 2):
+            if trail[position] == index:
+                return trail[position + 1]
+        return self.masks[index]
+
+    def push_checkpoint(self) -> int:
+        """Abre un punto de control. A partir de este momento cada cambio en el tablero queda anotado en la bitácora hasta que se deshaga con
+        `rollback` o se confirme con `clear_checkpoints`.
+
+        Returns:
+            int: cantidad de puntos de control abiertos (profundidad actual).
+        """
+        self._checkpoints.append((len(self.trail), self.unassigned_count, self._rebuilds))
+        return len(self._checkpoints)
+
+    def rollback(self) -> None:
+        """Deshace todos los cambios realizados desde el último punto de control y lo cierra. El costo es proporcional a la cantidad de cambios.
+
+        Raises:
+            RuntimeError: Ocurre si no hay puntos de control abiertos.
+        """
+        if not self._checkpoints:
+            raise RuntimeError("No hay puntos de control abiertos.")
+        start, unassigned_count, rebuilds = self._checkpoints.pop()
+        trail, masks, used, reasons, cells = self.trail, self.masks, self.used, self.reasons, self.geometry.cells
+        reason_slot = cells + self.geometry.unit_count
+        while len(trail) > start:
+            old = trail.pop()
+            slot = trail.pop()
+            if slot < cells:
+                masks[slot] = old
+            elif slot < reason_slot:
+                used[slot - cells] = old
+            else:
+                reasons[slot - reason_slot] = old
+        if rebuilds == self._rebuilds:
+            self.unassigned_count = unassigned_count
+        else:
+            self._rebuild_unassigned()
+
+    def clear_checkpoints(self) -> None:
+        """Confirma el estado actual del tablero, cerrando todos los puntos de control y vaciando la bitácora."""
+        self._checkpoints.clear()
+        self.trail.clear()
+
+    def _find_duplicate(self, index: int) -> Tuple[int, int]:
+        """Busca la celda asignada que comparte unidad y valor con la celda `index`."""
+        geo = self.geometry
+        mask = self.masks[index]
+        for peer in geo.peers[index]:
+            if self.masks[peer] == mask:
+                return geo.row_of[peer], geo.col_of[peer]
+        return geo.row_of[index], geo.col_of[index]
+
     def remove_values(self, row: int, col: int, value: int) -> bool:
         """Método que llama a los métodos de restricciones por filas, columnas y subgrilla."""
         changed = self._by_row_column(row, col, value) or self._by_subgrid(row, col, value)
         return changed
-    
+
     def _by_row_column(self, row: int, col: int, value: int) -> bool:
         """Elimina el valor asignado a una variable en (row, col) de las variables relacionadas por fila y columna."""
         changed = False
-        for i in range(9):
-            if not self.var(row, i).is_assigned() and i != col:
-                if value in self.var(row, i).domain:
-                    self.var(row, i).domain.remove(value)
-                    changed = True
-                    if self.verbose:
-                        print(f"Eliminando {value} de la fila {row}, columna {i}")
-            if not self.var(i, col).is_assigned() and i != row:
-                if value in self.var(i, col).domain:
-                    self.var(i, col).domain.remove(value)
+        bit = 1 << (value - 1)
+        size, bit_count = self.geometry.size, self.geometry.bit_count
+        tracer = self.tracer
+        for i in range(size):
+            for other_row, other_col in ((row, i), (i, col)):
+                if (other_row, other_col) == (row, col):
+                    continue
+                mask = self.masks[other_row * size + other_col]
+                if mask == bit:
+                    raise RuntimeError([(row, col), (other_row, other_col)])
+                if mask & bit and bit_count[mask] > 1:
+                    self._set_mask(other_row * size + other_col, mask & ~bit)
+                    self._add_reason(other_row * size + other_col, self.reasons[row * size + col])
                     changed = True
-                    if self.verbose:
-                        print(f"Eliminando {value} de la fila {i}, columna {col}")
-            
-            if self.var(row, i).is_assigned() and i != col and self.var(row, i).get_value() == value:
-                raise RuntimeError([(row, col), (row, i)])
-            if self.var(i, col).is_assigned() and i != row and self.var(i, col).get_value() == value:
-                raise RuntimeError([(row, col), (i, col)])
-        
+                    if tracer is not None:
+                        tracer("eliminate", rule="peers", cell=(other_row, other_col), values=[value])
+
         return changed
-    
+
     def _by_subgrid(self, row: int, col: int, value: int) -> bool:
         """Elimina el valor asignado a una variable en (row, col) de las variables relacionadas por subcuadrícula."""
         changed = False
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for subrow in range(start_row, start_row + 3):
-            for subcol in range(start_col, start_col + 3):
-                if not self.var(subrow, subcol).is_assigned() and subrow != row and subcol != col:
-                    if value in self.var(subrow, subcol).domain:
-                        self.var(subrow, subcol).domain.remove(value)
-                        changed = True
-                        if self.verbose:
-                            print(f"Eliminando {value} de la subcuadrícula ({subrow}, {subcol})")
-                
-                if self.var(subrow, subcol).is_assigned() and subrow != row and subcol != col and self.var(subrow, subcol).get_value() == value:
+        bit = 1 << (value - 1)
+        size, box_size, bit_count = self.geometry.size, self.geometry.box_size, self.geometry.bit_count
+        tracer = self.tracer
+        start_row, start_col = box_size * (row // box_size), box_size * (col // box_size)
+        for subrow in range(start_row, start_row + box_size):
+            for subcol in range(start_col, start_col + box_size):
+                if subrow == row or subcol == col:
+                    continue
+                mask = self.masks[subrow * size + subcol]
+                if mask == bit:
                     raise RuntimeError([(row, col), (subrow, subcol)])
-        
+                if mask & bit and bit_count[mask] > 1:
+                    self._set_mask(subrow * size + subcol, mask & ~bit)
+                    self._add_reason(subrow * size + subcol, self.reasons[row * size + col])
+                    changed = True
+                    if tracer is not None:
+                        tracer("eliminate", rule="peers", cell=(subrow, subcol), values=[value])
+
         return changed
-    
+
     def apply_naked_pairs(self) -> bool:
         """Aplica la regla de dominios pares en filas, columnas y subcuadrículas."""
         changed = False
-        for row in range(9):
-            changed |= self._naked_pairs_in_unit([self.var(row, col) for col in range(9)])
-            
-        for col in range(9):
-            changed |= self._naked_pairs_in_unit([self.var(row, col) for row in range(9)])
-            
-        for start_row in range(0, 9, 3):
-            for start_col in range(0, 9, 3):
-                subgrid = [self.var(start_row + i, start_col + j) for i in range(3) for j in range(3)]
-                changed |= self._naked_pairs_in_unit(subgrid)
-        
+        for unit in range(self.geometry.unit_count):
+            if self._naked_pairs_in_unit(unit):
+                changed = True
+
         return changed
-    
-    def _naked_pairs_in_unit(self, unit: List[Var]) -> bool:
-        """Aplica la regla de dominios pares a una unidad dada (fila, columna o subcuadrícula)."""
-        changed = False
-        pairs = [var for var in unit if len(var.domain) == 2]
-        pair_domains = [var.domain for var in pairs]
-        
-        for i in range(len(pair_domains)):
-            for j in range(i + 1, len(pair_domains)):
-                if pair_domains[i] == pair_domains[j]:
-                    pair_values = pair_domains[i]
-                    
-                    for var in unit:
-                        if var.domain != pair_values and not var.is_assigned():
-                            for value in pair_values:
-                                if value in var.domain:
-                                    var.domain.remove(value)
-                                    changed = True
-                                    if self.verbose:
-                                        print(f"Aplicando naked pair {pair_values} en unidad, eliminando {value} de {var.location}")
-        
+
+    def _eliminate(self, index: int, bits: int, rule: str, changed: List[int], reason: int, tracer) -> None:
+        """Elimina los valores de `bits` del dominio de una celda y anota la eliminación a nombre de la regla, agregando `reason` a las razones
+        de la celda. `tracer` es el trazador del tablero, que cada regla lee una sola vez por llamada.
+
+        Raises:
+            RuntimeError: Ocurre si la celda se queda sin valores posibles.
+        """
+        mask = self.masks[index]
+        if not mask & bits:
+            return
+        geo = self.geometry
+        self._add_reason(index, reason)
+        if not mask & ~bits:
+            raise RuntimeError([(geo.row_of[index], geo.col_of[index])])
+        self._set_mask(index, mask & ~bits)
+        self.eliminations[rule] += geo.bit_count[mask & bits]
+        changed.append(index)
+        if tracer is not None:
+            tracer("eliminate", rule=rule, cell=(geo.row_of[index], geo.col_of[index]), values=list(geo.mask_values[mask & bits]))
+
+    def _naked_pairs_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de dominios pares a una unidad dada (fila, columna o subcuadrícula): si dos celdas tienen el mismo dominio de dos
+        valores, ninguna otra celda de la unidad puede tomarlos.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        changed = []
+        masks, geo, tracer = self.masks, self.geometry, self.tracer
+        bit_count, cells = geo.bit_count, geo.units[unit]
+        counts: Dict[int, int] = {}
+        for index in cells:
+            mask = masks[index]
+            if bit_count[mask] == 2:
+                counts[mask] = counts.get(mask, 0) + 1
+
+        for pair, count in counts.items():
+            if count < 2:
+                continue
+            if count > 2:
+                raise RuntimeError([(geo.row_of[index], geo.col_of[index]) for index in cells if masks[index] == pair])
+            reason = self._unit_reason(unit)
+            for index in cells:
+                if masks[index] != pair and bit_count[masks[index]] > 1:
+                    self._eliminate(index, pair, "naked_pairs", changed, reason, tracer)
+
         return changed
-    
+
+    def _hidden_singles_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de singles ocultos: si un valor solo cabe en una celda de la unidad, esa celda toma el valor.
+
+        Raises:
+            RuntimeError: Ocurre si algún valor no cabe en ninguna celda de la unidad.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        masks, geo, tracer = self.masks, self.geometry, self.tracer
+        cells, full_mask = geo.units[unit], geo.full_mask
+        once = twice = 0
+        for index in cells:
+            mask = masks[index]
+            twice |= once & mask
+            once |= mask
+        if once != full_mask:
+            raise RuntimeError([(geo.row_of[index], geo.col_of[index]) for index in cells])
+
+        changed = []
+        singles = once & ~twice & ~self.used[unit]
+        reason = self._unit_reason(unit) if singles else 0
+        while singles:
+            bit = singles & -singles
+            singles ^= bit
+            for index in cells:
+                if masks[index] & bit:
+                    self._eliminate(index, full_mask & ~bit, "hidden_singles", changed, reason, tracer)
+                    break
+
+        return changed
+
+    def _pointing_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de pares apuntadores: si dentro de una subcuadrícula un valor solo cabe en una de sus filas (o columnas), se elimina
+        de esa fila (o columna) fuera de la subcuadrícula. Solo actúa sobre las subcuadrículas.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        changed = []
+        geo, tracer = self.geometry, self.tracer
+        size, box_size = geo.size, geo.box_size
+        if unit < 2 * size:
+            return changed
+
+        cells, box = geo.units[unit], unit - 2 * size
+        free = geo.full_mask & ~self.used[unit]
+        for segments, line_of, line_offset in (([cells[start:start + box_size] for start in range(0, size, box_size)], geo.row_of, 0),
+                                              ([cells[start::box_size] for start in range(box_size)], geo.col_of, size)):
+            for segment, locked in self._locked_segments(segments, free):
+                reason = self._unit_reason(unit)
+                for index in geo.units[line_offset + line_of[segment[0]]]:
+                    if geo.box_of[index] != box:
+                        self._eliminate(index, locked, "pointing", changed, reason, tracer)
+
+        return changed
+
+    def _box_line_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de reducción caja/línea: si dentro de una fila (o columna) un valor solo cabe en una subcuadrícula, se elimina del
+        resto de esa subcuadrícula. Solo actúa sobre filas y columnas.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        changed = []
+        geo, tracer = self.geometry, self.tracer
+        size, box_size = geo.size, geo.box_size
+        if unit >= 2 * size:
+            return changed
+
+        cells = geo.units[unit]
+        free = geo.full_mask & ~self.used[unit]
+        segments = [cells[start:start + box_size] for start in range(0, size, box_size)]
+        for segment, locked in self._locked_segments(segments, free):
+            reason = self._unit_reason(unit)
+            for index in geo.units[2 * size + geo.box_of[segment[0]]]:
+                if index not in segment:
+                    self._eliminate(index, locked, "box_line", changed, reason, tracer)
+
+        return changed
+
+    def _locked_segments(self, segments: List[List[int]], free: int) -> List[Tuple[List[int], int]]:
+        """Retorna cada segmento (intersección de una subcuadrícula con una fila o columna) junto con los valores de `free` que, dentro de la
+        unidad, solo caben en él. Omite los segmentos sin valores bloqueados."""
+        masks = self.masks
+        segment_masks = []
+        once = twice = 0
+        for segment in segments:
+            mask = 0
+            for index in segment:
+                mask |= masks[index]
+            segment_masks.append(mask)
+            twice |= once & mask
+            once |= mask
+        only = once & ~twice & free
+        return [(segment, mask & only) for segment, mask in zip(segments, segment_masks) if mask & only]
+
+    def _naked_subsets_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de subconjuntos desnudos de 3 y 4 celdas: si `n` celdas de la unidad solo admiten, entre todas, `n` valores, ninguna
+        otra celda de la unidad puede tomarlos. Los pares los cubre `_naked_pairs_in_unit`.
+
+        Raises:
+            RuntimeError: Ocurre si `n` celdas admiten menos de `n` valores entre todas.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        masks, geo, tracer = self.masks, self.geometry, self.tracer
+        bit_count = geo.bit_count
+        cells = [index for index in geo.units[unit] if bit_count[masks[index]] > 1]
+        changed = []
+        for size in (3, 4):
+            if len(cells) <= size:
+                break
+            for subset in combinations([index for index in cells if bit_count[masks[index]] <= size], size):
+                union = 0
+                for index in subset:
+                    union |= masks[index]
+                if bit_count[union] < size:
+                    raise RuntimeError([(geo.row_of[index], geo.col_of[index]) for index in subset])
+                if bit_count[union] == size:
+                    reason = self._unit_reason(unit)
+                    for index in cells:
+                        if index not in subset:
+                            self._eliminate(index, union, "naked_subsets", changed, reason, tracer)
+                    if changed:
+                        return changed
+
+        return changed
+
+    def _hidden_subsets_in_unit(self, unit: int) -> List[int]:
+        """Aplica la regla de subconjuntos ocultos de 2 a 4 valores: si `n` valores solo caben, entre todos, en `n` celdas de la unidad, esas
+        celdas no pueden tomar ningún otro valor.
+
+        Raises:
+            RuntimeError: Ocurre si `n` valores caben en menos de `n` celdas entre todos.
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        masks, geo, tracer = self.masks, self.geometry, self.tracer
+        bit_count, cells = geo.bit_count, geo.units[unit]
+        positions = [0] * geo.size
+        for slot, index in enumerate(cells):
+            if bit_count[masks[index]] > 1:
+                for value in geo.mask_values[masks[index]]:
+                    positions[value - 1] |= 1 << slot
+
+        changed = []
+        for size in (2, 3, 4):
+            digits = [digit for digit in range(geo.size) if 2 <= bit_count[positions[digit]] <= size]
+            for subset in combinations(digits, size):
+                union = 0
+                for digit in subset:
+                    union |= positions[digit]
+                if bit_count[union] < size:
+                    raise RuntimeError([(geo.row_of[index], geo.col_of[index]) for index in cells])
+                if bit_count[union] == size:
+                    keep = values_to_mask(digit + 1 for digit in subset)
+                    reason = self._unit_reason(unit)
+                    for slot in range(geo.size):
+                        if union >> slot & 1:
+                            self._eliminate(cells[slot], geo.full_mask & ~keep, "hidden_subsets", changed, reason, tracer)
+                    if changed:
+                        return changed
+
+        return changed
+
+    def _x_wing(self) -> List[int]:
+        """Aplica la regla X-wing: si en dos filas un valor solo cabe en las mismas dos columnas, se elimina de esas columnas en el resto de
+        filas (y lo mismo intercambiando filas y columnas).
+
+        Returns:
+            List[int]: índices de las celdas cuyo dominio fue reducido.
+        """
+        masks, geo, tracer = self.masks, self.geometry, self.tracer
+        size, units, bit_count = geo.size, geo.units, geo.bit_count
+        changed = []
+        for bit in (1 << digit for digit in range(size)):
+            for line_offset, cross_offset in ((0, size), (size, 0)):
+                lines_by_positions: Dict[int, int] = {}
+                for line in range(size):
+                    positions = 0
+                    for slot, index in enumerate(units[line_offset + line]):
+                        if masks[index] & bit and bit_count[masks[index]] > 1:
+                            positions |= 1 << slot
+                    if bit_count[positions] != 2:
+                        continue
+                    if positions not in lines_by_positions:
+                        lines_by_positions[positions] = line
+                        continue
+                    pair = (lines_by_positions[positions], line)
+                    reason = self._unit_reason(line_offset + pair[0], line_offset + line)
+                    for slot in range(size):
+                        if positions >> slot & 1:
+                            for other, index in enumerate(units[cross_offset + slot]):
+                                if other not in pair:
+                                    self._eliminate(index, bit, "x_wing", changed, reason, tracer)
+                    if changed:
+                        return changed
+
+        return changed
+
     def assign_value(self, row: int, col: int, value: int) -> None:
         """Método para asignar un valor dado a una variable en las coordenadas dadas.
 
@@ -214,30 +1013,141 @@ class SudokuBoard:
 
         Raises:
             ValueError: Ocurre en Var.assign_value cuando se intenta asignar un valor fuera del dominio de esta.
-            RuntimeError: Ocurre en propagate_constraints cuando se viola alguna restricción establecida.
+            RuntimeError: Ocurre en propagate_constraints cuando se viola alguna restricción establecida. El tablero queda a medio propagar, por lo
+                que la asignación debe hacerse tras `push_checkpoint` y deshacerse con `rollback`.
+
+        La razón de la celda pasa a ser el nivel de la asignación (la cantidad de puntos de control abiertos), o ninguna si no hay puntos de
+        control, en cuyo caso la asignación es definitiva.
         """
-        try:
-            self.var(row, col).assign_value(value)
-            self.propagate_constraints()
-        except ValueError:
-            raise ValueError()
-        except RuntimeError as r:
-            raise RuntimeError(r.args[0])
-        finally:
-            if not self.var(row, col).is_assigned():
-                self.var(row, col).reset_domain()
-                
+        self.var(row, col).assign_value(value)
+        self._set_reason(row * self.geometry.size + col, 1 << len(self._checkpoints) if self._checkpoints else 0)
+        self.propagate_constraints([(row, col)])
+
+    def to_string(self) -> str:
+        """Método que representa el tablero como una cadena de un carácter por celda (81 dígitos en el tablero clásico), en el mismo formato que
+        recibe `Tester.string_to_board`.
+
+        Returns:
+            str: valores fila por fila como símbolos de `SYMBOLS`, con 0 en las celdas no asignadas.
+        """
+        symbols, bit_count = self.geometry.symbols, self.geometry.bit_count
+        return "".join(symbols[mask.bit_length() - 1] if bit_count[mask] == 1 else "0" for mask in self.masks)
+
     def get_unassigned_values(self) -> List[Tuple[int, int]]:
         """Método que retorna una lista con las coordenadas de las variables que no se han asignado. Normalmente, se necesitan conocer para evitar modificar las pistas originales del tablero.
 
         Returns:
             List[Tuple[int, int]]: Estructura que contiene las coordenadas de cada una de las variables que no han sido asignadas.
         """
-        return [(row, col) for col in range(9) for row in range(9) if not self.var(row, col).is_assigned()]
-   
+        geo = self.geometry
+        cells = sorted(self.unassigned[:self.unassigned_count], key=geo.column_rank.__getitem__)
+        return [(geo.row_of[index], geo.col_of[index]) for index in cells]
+
 class SudokuValidator:
     """Clase que encapsula la lógica para verificar las soluciones obtenidas.
+
+    `is_valid` verifica un `SudokuBoard` resuelto. `validate`, `find_conflict` y `validate_many` trabajan directamente sobre cadenas de un
+    carácter por celda, listas planas de enteros o máscaras de candidatos (incluido un `SudokuBoard`), sin construir tableros, y admiten
+    tableros parciales. El tamaño del tablero (4x4, 9x9, 16x16 o 25x25) se deduce de su cantidad de celdas.
     """
+
+    @staticmethod
+    def validate(grid, complete: bool = True, masks: bool = False) -> bool:
+        """Método que verifica que un tablero no repita valores en ninguna fila, columna ni subgrilla.
+
+        Args:
+            grid (str | Sequence[int] | SudokuBoard): tablero como cadena con un símbolo de `SYMBOLS` por celda (`0` o `.` para las celdas
+                vacías), lista plana de valores (0 para las celdas vacías), lista plana de máscaras (con `masks=True`) o `SudokuBoard`.
+            complete (bool, optional): si es True se exige además que todas las celdas estén asignadas. Defaults to True.
+            masks (bool, optional): si es True, `grid` es una lista de máscaras de candidatos; las celdas con más de un candidato se consideran
+                vacías. Defaults to False.
+
+        Raises:
+            ValueError: Ocurre si `grid` no tiene la cantidad de celdas de un tablero admitido o contiene valores inválidos.
+
+        Returns:
+            bool: True si el tablero es válido. False en caso contrario.
+        """
+        values, geo = SudokuValidator._values(grid, masks)
+        if complete:
+            return 0 not in values and all(len(set(cells(values))) == geo.size for cells in geo.unit_getters)
+        return SudokuValidator._first_conflict(values, geo) is None
+
+    @staticmethod
+    def find_conflict(grid, masks: bool = False) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Método que busca el primer par de celdas que repiten un valor en una misma fila, columna o subgrilla.
+
+        Las celdas se recorren por filas; el par retornado es el de la primera celda que repite un valor ya visto, junto con la celda anterior
+        que tiene ese valor.
+
+        Args:
+            grid (str | Sequence[int] | SudokuBoard): tablero en cualquiera de los formatos de `validate`.
+            masks (bool, optional): si es True, `grid` es una lista de máscaras de candidatos. Defaults to False.
+
+        Raises:
+            ValueError: Ocurre si `grid` no tiene la cantidad de celdas de un tablero admitido o contiene valores inválidos.
+
+        Returns:
+            Optional[Tuple[Tuple[int, int], Tuple[int, int]]]: coordenadas (fila, columna) de las dos celdas en conflicto, o None si no hay
+                ninguno.
+        """
+        return SudokuValidator._first_conflict(*SudokuValidator._values(grid, masks))
+
+    @staticmethod
+    def validate_many(grids, complete: bool = True, masks: bool = False) -> List[bool]:
+        """Método que aplica `validate` a muchos tableros.
+
+        Args:
+            grids (Iterable[str | Sequence[int] | SudokuBoard]): tableros en cualquiera de los formatos de `validate`.
+            complete (bool, optional): si es True se exige además que todas las celdas estén asignadas. Defaults to True.
+            masks (bool, optional): si es True, los tableros son listas de máscaras de candidatos. Defaults to False.
+
+        Raises:
+            ValueError: Ocurre si algún tablero no tiene la cantidad de celdas de un tablero admitido o contiene valores inválidos.
+
+        Returns:
+            List[bool]: resultado de cada tablero, en el mismo orden.
+        """
+        return [SudokuValidator.validate(grid, complete, masks) for grid in grids]
+
+    @staticmethod
+    def _values(grid, masks: bool) -> Tuple[List[int], Geometry]:
+        """Convierte un tablero en cualquiera de los formatos admitidos en una lista de valores (0 en las celdas vacías) y su geometría."""
+        if isinstance(grid, SudokuBoard):
+            geo, grid, masks = grid.geometry, grid.masks, True
+        else:
+            geo = Geometry.for_cells(len(grid))
+        if isinstance(grid, str):
+            symbol_value = geo.symbol_value
+            values = [symbol_value.get(char, -1) for char in grid]
+        elif masks:
+            if min(grid) < 0 or max(grid) > geo.full_mask:
+                raise ValueError("El tablero contiene máscaras inválidas.")
+            bit_count = geo.bit_count
+            return [mask.bit_length() if bit_count[mask] == 1 else 0 for mask in grid], geo
+        else:
+            values = list(grid)
+        if min(values) < 0 or max(values) > geo.size:
+            raise ValueError("El tablero contiene valores inválidos.")
+        return values, geo
+
+    @staticmethod
+    def _first_conflict(values: List[int], geo: Geometry = STANDARD) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Busca el primer par de celdas en conflicto en una lista de valores."""
+        used = [0] * geo.unit_count
+        cell_units, row_of, col_of = geo.cell_units, geo.row_of, geo.col_of
+        for index, value in enumerate(values):
+            if value:
+                bit = 1 << (value - 1)
+                row, col, box = cell_units[index]
+                if (used[row] | used[col] | used[box]) & bit:
+                    unit = next(unit for unit in (row, col, box) if used[unit] & bit)
+                    other = next(cell for cell in geo.units[unit] if values[cell] == value)
+                    return (row_of[other], col_of[other]), (row_of[index], col_of[index])
+                used[row] |= bit
+                used[col] |= bit
+                used[box] |= bit
+        return None
     
     @staticmethod
     def is_valid(board: SudokuBoard) -> bool:
@@ -263,9 +1173,10 @@ class SudokuValidator:
         Returns:
             bool: True si el tablero `board` es válido. False en caso contrario.
         """
-        for row in range(9):
+        size = board.geometry.size
+        for row in range(size):
             seen = set()
-            for col in range(9):
+            for col in range(size):
                 value = board.var(row, col).get_value()
                 if value != 0:
                     if value in seen:
@@ -284,9 +1195,10 @@ class SudokuValidator:
         Returns:
             bool: True si el tablero `board` es válido. False en caso contrario.
         """
-        for col in range(9):
+        size = board.geometry.size
+        for col in range(size):
             seen = set()
-            for row in range(9):
+            for row in range(size):
                 value = board.var(row, col).get_value()
                 if value != 0:
                     if value in seen:
@@ -305,11 +1217,12 @@ class SudokuValidator:
         Returns:
             bool: True si el tablero `board` es válido. False en caso contrario.
         """
-        for start_row in range(0, 9 ,3):
-            for start_col in range(0, 9, 3):
+        size, box_size = board.geometry.size, board.geometry.box_size
+        for start_row in range(0, size, box_size):
+            for start_col in range(0, size, box_size):
                 seen = set()
-                for row in range(start_row, start_row+3):
-                    for col in range(start_col, start_col+3):
+                for row in range(start_row, start_row+box_size):
+                    for col in range(start_col, start_col+box_size):
                         value = board.var(row, col).get_value()
                         if value != 0:
                             if value in seen:
@@ -318,88 +1231,580 @@ class SudokuValidator:
                             
         return True
     
+def first_unassigned(board: SudokuBoard) -> int:
+    """Heurística de selección de variable que elige la primera celda no asignada recorriendo el tablero columna por columna.
+
+    Args:
+        board (SudokuBoard): tablero en resolución.
+
+    Returns:
+        int: índice de la celda elegida.
+    """
+    return min(board.unassigned[:board.unassigned_count], key=board.geometry.column_rank.__getitem__)
+
+
+def mrv_degree(board: SudokuBoard) -> int:
+    """Heurística de selección de variable de mínimos valores restantes (MRV). Los empates se rompen con la heurística de grado: se prefiere la
+    celda con más pares sin asignar, pues su asignación restringe más al resto del tablero.
+
+    Args:
+        board (SudokuBoard): tablero en resolución.
+
+    Returns:
+        int: índice de la celda elegida.
+    """
+    masks, bit_count, peers = board.masks, board.geometry.bit_count, board.geometry.peers
+    candidates = board.unassigned[:board.unassigned_count]
+    best_size = min(bit_count[masks[index]] for index in candidates)
+    tied = [index for index in candidates if bit_count[masks[index]] == best_size]
+    if len(tied) == 1:
+        return tied[0]
+    return max(tied, key=lambda index: sum(1 for peer in peers[index] if bit_count[masks[peer]] != 1))
+
+
+def domain_order(board: SudokuBoard, index: int) -> List[int]:
+    """Heurística de ordenamiento de valores que respeta el orden natural del dominio.
+
+    Args:
+        board (SudokuBoard): tablero en resolución.
+        index (int): índice de la celda elegida.
+
+    Returns:
+        List[int]: valores a intentar, en orden.
+    """
+    return list(board.geometry.mask_values[board.masks[index]])
+
+
+def least_constraining_values(board: SudokuBoard, index: int) -> List[int]:
+    """Heurística de ordenamiento de valores que intenta primero los valores que eliminan menos candidatos de los pares sin asignar.
+
+    Args:
+        board (SudokuBoard): tablero en resolución.
+        index (int): índice de la celda elegida.
+
+    Returns:
+        List[int]: valores a intentar, en orden.
+    """
+    masks, geo = board.masks, board.geometry
+    peers = [masks[peer] for peer in geo.peers[index] if geo.bit_count[masks[peer]] != 1]
+    return sorted(geo.mask_values[masks[index]], key=lambda value: sum(1 for mask in peers if mask >> (value - 1) & 1))
+
+
+VARIABLE_ORDERINGS = {"first": first_unassigned, "mrv": mrv_degree}
+"""Heurísticas de selección de variable disponibles por nombre."""
+
+VALUE_ORDERINGS = {"domain": domain_order, "lcv": least_constraining_values}
+"""Heurísticas de ordenamiento de valores disponibles por nombre."""
+
+
 class SudokuSolver:
     """Clase que encapsula la lógica del resolutor."""
-    
-    def __init__(self, board: SudokuBoard, verbose: bool = False):
+
+    def __init__(self, board: SudokuBoard, verbose: bool = False, variable_order="mrv", value_order="domain", tracer=None):
         """Constructor
 
         Args:
             board (SudokuBoard): tablero que debe ser resuelto.
-            verbose (bool, optional): Si es True, se activará el modo verbose. Defaults to False.
+            verbose (bool, optional): Si es True, se activará el modo verbose (un `PrintTracer`). Defaults to False.
+            variable_order (str | Callable[[SudokuBoard], int], optional): heurística de selección de variable, ya sea un nombre de
+                `VARIABLE_ORDERINGS` o una función que recibe el tablero y retorna el índice de la celda a ramificar. Defaults to "mrv".
+            value_order (str | Callable[[SudokuBoard, int], List[int]], optional): heurística de ordenamiento de valores, ya sea un nombre de
+                `VALUE_ORDERINGS` o una función que recibe el tablero y el índice de la celda y retorna los valores a intentar. Defaults to "domain".
+            tracer (Callable[..., None], optional): trazador que recibe los eventos de la búsqueda (ver `PrintTracer`). Para trazar también la
+                propagación se debe asignar al tablero. Defaults to None.
+
+        El atributo `deadline` (instante de `time.perf_counter()`, None por defecto) permite limitar el tiempo de búsqueda: al superarlo la
+        búsqueda se interrumpe con `TimeoutError`. El atributo `stats` (`SolverStats`) guarda las estadísticas de la última resolución.
         """
         self.board = board
         self.verbose = verbose
-        self.conflict_tracker = {}
-        
-    def solve(self) -> bool:
+        self.tracer = tracer if tracer is not None else (PrintTracer() if verbose else None)
+        self.variable_order = variable_order
+        self.value_order = value_order
+        self.deadline = None
+        self.solution = None
+        self.stats = SolverStats()
+        self._stack: List[list] = []
+        self._active = False
+
+    @property
+    def nodes(self) -> int:
+        """int: asignaciones intentadas en la última resolución."""
+        return self.stats.assignments
+
+    @property
+    def backtracks(self) -> int:
+        """int: asignaciones deshechas en la última resolución."""
+        return self.stats.backtracks
+
+    def solve(self, variable_order=None, value_order=None, max_nodes: int = None, max_time: float = None) -> Optional[bool]:
         """Método que sirve para disparar el algoritmo de resolución y controlar el flujo en caso de excepciones.
 
+        Args:
+            variable_order (str | Callable[[SudokuBoard], int], optional): heurística de selección de variable para esta resolución. Defaults to None. Por defecto se usa la del constructor.
+            value_order (str | Callable[[SudokuBoard, int], List[int]], optional): heurística de ordenamiento de valores para esta resolución. Defaults to None. Por defecto se usa la del constructor.
+            max_nodes (int, optional): asignaciones máximas antes de pausar la búsqueda. Defaults to None. Por defecto no hay límite.
+            max_time (float, optional): segundos máximos antes de pausar la búsqueda. Defaults to None. Por defecto no hay límite.
+
         Returns:
-            bool: True el tablero fue solucionado. False caso contrario.
+            Optional[bool]: True el tablero fue solucionado. False caso contrario. None si se agotó `max_nodes` o `max_time` antes de terminar; la
+                búsqueda queda en pausa (`paused`) y `resume` la continúa desde el mismo punto.
         """
+        self._configure(variable_order, value_order)
+        self._start(limit=1)
+        return self.resume(max_nodes, max_time)
+
+    @property
+    def paused(self) -> bool:
+        """bool: True si hay una búsqueda iniciada con `solve` que se detuvo por agotar su presupuesto y puede continuarse con `resume`."""
+        return self._active
+
+    def resume(self, max_nodes: int = None, max_time: float = None) -> Optional[bool]:
+        """Método que continúa una búsqueda pausada, con un nuevo presupuesto.
+
+        Args:
+            max_nodes (int, optional): asignaciones máximas en esta llamada. Defaults to None. Por defecto no hay límite.
+            max_time (float, optional): segundos máximos en esta llamada. Defaults to None. Por defecto no hay límite.
+
+        Raises:
+            RuntimeError: Ocurre si no hay una búsqueda en pausa.
+            TimeoutError: Ocurre si se supera `deadline`.
+
+        Returns:
+            Optional[bool]: True el tablero fue solucionado. False caso contrario. None si la búsqueda vuelve a quedar en pausa.
+        """
+        if not self._active:
+            raise RuntimeError("No hay una búsqueda en pausa.")
+        start = time.perf_counter()
         try:
-            return self.backjumping_solve()
-        except RuntimeError:
-            if self.verbose:
-                print("Se ha detectado un conflicto que no puede ser resuelto.")
-            return False
-        
-    def backjumping_solve(self, row: int = 0, col: int = 0) -> bool:
-        """Método que resuelve un tablero dado usando el algoritmo de backjumping.
+            solved = self.backjumping_solve(max_nodes, max_time)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self.stats.search_time = self._elapsed - self.stats.propagation_time
+            self.stats.eliminations = dict(self.board.eliminations)
+        if solved:
+            self.board.clear_checkpoints()
+            self._stack = []
+            self._active = False
+        elif solved is not None:
+            self._active = False
+            if self.tracer is not None:
+                self.tracer("unsolvable")
+        return solved
+
+    def cancel(self) -> None:
+        """Método que abandona una búsqueda en pausa: deshace sus asignaciones y cierra los puntos de control que abrió en el tablero, que queda
+        como antes de `solve`. No hace nada si no hay una búsqueda en pausa."""
+        self._unwind()
+
+    def backjumping_solve(self, max_nodes: int = None, max_time: float = None) -> Optional[bool]:
+        """Método que resuelve un tablero dado usando el algoritmo de backjumping dirigido por conflictos (CBJ).
+
+        La búsqueda es iterativa: en lugar de recursión usa una pila explícita de puntos de elección, por lo que su profundidad no está limitada
+        por la pila de Python y puede detenerse y continuarse en cualquier momento. Cada punto de elección guarda la celda, los valores por
+        intentar y su conjunto de conflicto: los niveles que explican los valores descartados de la celda, como máscara de bits. El conjunto
+        parte de las razones del tablero para los candidatos que la propagación ya eliminó (`SudokuBoard.reasons`) y suma la explicación de
+        cada valor que falla. Al agotar sus valores, la búsqueda salta directamente al nivel más profundo del conjunto, deshaciendo los niveles
+        intermedios (que no pueden resolver el conflicto), y le traspasa el resto del conjunto. Si el conjunto está vacío, el tablero no tiene
+        solución.
+
+        Antes de cada asignación se abre un punto de control en el tablero; si la asignación o la búsqueda posterior fallan, `rollback` restaura
+        exactamente los dominios (y las razones) que la propagación había reducido, por lo que la búsqueda no pierde soluciones al retroceder.
+
+        Args:
+            max_nodes (int, optional): asignaciones máximas en esta llamada. Defaults to None.
+            max_time (float, optional): segundos máximos en esta llamada. Defaults to None.
+
+        Raises:
+            TimeoutError: Ocurre si se supera `deadline`.
+
+        Returns:
+            Optional[bool]: True si se encontraron las soluciones buscadas (el tablero queda en la última), False si se agotó el árbol (el tablero
+                queda como al empezar) o None si se agotó el presupuesto.
+        """
+        board, stats, stack, tracer = self.board, self.stats, self._stack, self.tracer
+        row_of, col_of, reasons = board.geometry.row_of, board.geometry.col_of, board.reasons
+        base = self._base
+        node_limit = None if max_nodes is None else stats.assignments + max_nodes
+        time_limit = None if max_time is None else time.perf_counter() + max_time
+        while True:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise TimeoutError("Se agotó el tiempo de búsqueda.")
+            if (node_limit is not None and stats.assignments >= node_limit) or (time_limit is not None and time.perf_counter() > time_limit):
+                return None
+
+            if self._expand:
+                self._expand = False
+                depth = len(stack)
+                if board.unassigned_count:
+                    index = self._select_variable(board)
+                    stack.append([index, self._order_values(board, index), 0, reasons[index]])
+                    if depth + 1 > stats.max_depth:
+                        stats.max_depth = depth + 1
+                    continue
+                if tracer is not None:
+                    tracer("solution", depth=depth)
+                if self.solution is None:
+                    self.solution = board.to_string()
+                self._found += 1
+                if self._found >= self._limit:
+                    return True
+                if not stack:
+                    return False
+                self._refute(((2 << (base + depth)) - 1) & ~((2 << base) - 1))
+                continue
+
+            frame = stack[-1]
+            index, values, position, conflict = frame
+            level = base + len(stack)
+            row, col = row_of[index], col_of[index]
+            if position < len(values):
+                value = values[position]
+                frame[2] = position + 1
+                if tracer is not None:
+                    tracer("assign", cell=(row, col), value=value, depth=len(stack))
+                stats.assignments += 1
+                board.push_checkpoint()
+                started = time.perf_counter()
+                try:
+                    board.assign_value(row, col, value)
+                except RuntimeError as error:
+                    stats.propagation_time += time.perf_counter() - started
+                    frame[3] |= board.explain(error.args[0]) & ~(1 << level)
+                    if tracer is not None:
+                        tracer("conflict", cell=(row, col), value=value, cells=error.args[0])
+                    board.rollback()
+                    stats.backtracks += 1
+                    continue
+                stats.propagation_time += time.perf_counter() - started
+                self._expand = True
+                continue
+
+            conflict &= ~((2 << base) - 1)
+            target = conflict.bit_length() - 1 if conflict else base
+            stats.backjumps += 1
+            stats.total_backjump_distance += level - target
+            stats.max_backjump = max(stats.max_backjump, level - target)
+            if tracer is not None:
+                tracer("exhausted", cell=(row, col), depth=len(stack), distance=level - target)
+            stack.pop()
+            while len(stack) > target - base:
+                self._undo_choice()
+            if not stack:
+                return False
+            self._refute(conflict)
+
+    def count_solutions(self, limit: int = None, variable_order=None, value_order=None) -> int:
+        """Método que cuenta las soluciones del tablero sin modificarlo.
+
+        La búsqueda es la misma de `backjumping_solve`, pero cada solución encontrada se trata como un fallo explicado por todos los niveles
+        abiertos, de modo que la búsqueda retrocede cronológicamente desde ella y sigue hasta agotar el árbol o alcanzar `limit`. Al terminar se
+        deshacen todas las asignaciones (con `rollback`, sin reconstruir tableros). La primera solución encontrada queda en el atributo
+        `solution`.
+
+        Args:
+            limit (int, optional): cantidad de soluciones a partir de la cual se deja de buscar. Defaults to None. Por defecto se cuentan todas.
+            variable_order (str | Callable[[SudokuBoard], int], optional): heurística de selección de variable. Defaults to None. Por defecto se usa la del constructor.
+            value_order (str | Callable[[SudokuBoard, int], List[int]], optional): heurística de ordenamiento de valores. Defaults to None. Por defecto se usa la del constructor.
+
+        Raises:
+            ValueError: Ocurre si `limit` es menor que 1.
+            TimeoutError: Ocurre si se supera `deadline`.
+
+        Returns:
+            int: cantidad de soluciones encontradas (como máximo `limit`).
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"El límite de soluciones debe ser al menos 1: {limit}")
+        self._configure(variable_order, value_order)
+        self._start(float("inf") if limit is None else limit)
+        start = time.perf_counter()
+        try:
+            self.backjumping_solve()
+            return self._found
+        finally:
+            self._unwind()
+            self.stats.search_time = time.perf_counter() - start - self.stats.propagation_time
+            self.stats.eliminations = dict(self.board.eliminations)
+
+    def is_unique(self) -> bool:
+        """Método que indica si el tablero tiene exactamente una solución. Se detiene al encontrar la segunda.
+
+        Returns:
+            bool: True si el tablero tiene solución única. False caso contrario.
+        """
+        return self.count_solutions(limit=2) == 1
+
+    def _configure(self, variable_order, value_order) -> None:
+        """Selecciona las heurísticas de una búsqueda y reinicia las estadísticas."""
+        variable_order = variable_order or self.variable_order
+        value_order = value_order or self.value_order
+        self._select_variable = VARIABLE_ORDERINGS.get(variable_order, variable_order)
+        self._order_values = VALUE_ORDERINGS.get(value_order, value_order)
+        self.stats = SolverStats()
+
+    def _start(self, limit: int) -> None:
+        """Prepara una búsqueda nueva, que se detendrá al encontrar `limit` soluciones. Si había una búsqueda en pausa, primero se abandona."""
+        self._unwind()
+        self._base = len(self.board._checkpoints)
+        self._expand = True
+        self._active = True
+        self._limit = limit
+        self._found = 0
+        self._elapsed = 0.0
+        self.solution = None
+
+    def _unwind(self) -> None:
+        """Deshace todas las asignaciones de la búsqueda en curso, si la hay, y descarta sus puntos de elección."""
+        if self._stack and len(self.board._checkpoints) < self._base + len(self._stack):
+            self._stack.pop()
+        while self._stack:
+            self._undo_choice()
+        self._active = False
+
+    def _undo_choice(self) -> None:
+        """Deshace la asignación vigente del punto de elección más profundo y lo descarta."""
+        index, values, position, _ = self._stack.pop()
+        if self.tracer is not None:
+            geo = self.board.geometry
+            self.tracer("backtrack", cell=(geo.row_of[index], geo.col_of[index]), value=values[position - 1], depth=len(self._stack) + 1)
+        self.board.rollback()
+        self.stats.backtracks += 1
+
+    def _refute(self, conflict: int) -> None:
+        """Deshace la asignación vigente del punto de elección más profundo, que falló por los niveles de `conflict`, y suma esos niveles
+        (salvo el propio) a su conjunto de conflicto para intentar su siguiente valor."""
+        frame = self._stack[-1]
+        level = self._base + len(self._stack)
+        if self.tracer is not None:
+            geo = self.board.geometry
+            self.tracer("backtrack", cell=(geo.row_of[frame[0]], geo.col_of[frame[0]]), value=frame[1][frame[2] - 1], depth=len(self._stack))
+        self.board.rollback()
+        self.stats.backtracks += 1
+        frame[3] |= conflict & ~(1 << level)
+
+
+class DancingLinksSolver:
+    """Resolutor que modela el tablero como un problema de cobertura exacta de `4 * celdas` columnas (324 en el tablero clásico) y lo resuelve
+    con el Algoritmo X de Knuth sobre Dancing Links.
+
+    Cada fila de la matriz corresponde a colocar un valor en una celda y cubre cuatro columnas: la celda, el valor en su fila, el valor en su
+    columna y el valor en su subcuadrícula. Solo se generan filas para los candidatos que siguen en el dominio de cada celda, de modo que la
+    propagación del tablero reduce la matriz antes de buscar. La búsqueda elige siempre la columna con menos filas, es completa y no depende
+    del orden de las celdas.
+
+    Implementa el mismo contrato que `SudokuSolver` (`solve()` y los atributos `board`, `deadline`, `nodes` y `backtracks`), por lo que puede
+    usarse como `Tester.algorithm`. Aquí `nodes` cuenta las filas elegidas y `backtracks` las columnas que quedaron sin filas.
+    """
+
+    def __init__(self, board: SudokuBoard, verbose: bool = False, tracer=None):
+        """Constructor
+
+        Args:
+            board (SudokuBoard): tablero que debe ser resuelto.
+            verbose (bool, optional): Si es True, se activará el modo verbose (un `PrintTracer`). Defaults to False.
+            tracer (Callable[..., None], optional): trazador que recibe los eventos `solution` y `unsolvable` (ver `PrintTracer`). Defaults to None.
+        """
+        self.board = board
+        self.verbose = verbose
+        self.tracer = tracer if tracer is not None else (PrintTracer() if verbose else None)
+        self.deadline = None
+        self.solution = None
+        self.nodes = 0
+        self.backtracks = 0
+
+    def solve(self) -> bool:
+        """Método que busca la primera solución y la escribe en el tablero.
 
         Returns:
             bool: True el tablero fue solucionado. False caso contrario.
         """
-        unassigned_vars = self.board.get_unassigned_values()
-        if not unassigned_vars:
-            if self.verbose:
-                print("El tablero ha sido resuelto exitosamente.")
+        size = self.board.geometry.size
+        for solution in self.iter_solutions():
+            for row in range(size):
+                for col in range(size):
+                    if not self.board.var(row, col).is_assigned():
+                        self.board.assign_value(row, col, solution[row][col])
+            if self.tracer is not None:
+                self.tracer("solution", depth=len(solution))
             return True
-        
-        row, col = unassigned_vars[0]
-        
-        for value in self.board.var(row, col).domain:
-            if self.verbose:
-                print(f"Intentando asignar {value} a la celda ({row}, {col})")
-            
-            try:
-                self.board.assign_value(row, col, value)
-                if self.backjumping_solve(row, col):
-                    return True
-            except RuntimeError as conflict:
-                conflicting_cell = self.find_conflicting_var(conflict.args[0], row, col)
-                if self.verbose:
-                    print(f"Conflicto detectado en ({row}, {col}) con {conflict.args[0]}. Intentando retroceder a {conflicting_cell}.")
-                if conflicting_cell:
-                    self.board.var(row, col).reset_domain()
-                    self.board.propagate_constraints()
-                    return self.backjumping_solve(*conflicting_cell)
-            
-            if self.verbose:
-                print(f"Restableciendo dominio de la celda ({row}, {col}) y propagando restricciones.")
-            self.board.var(row, col).reset_domain()
-            self.board.propagate_constraints()
-        
-        if self.verbose:
-            print(f"No se encontró solución al intentar asignar valores a la celda ({row}, {col}). Retrocediendo.")
+
+        if self.tracer is not None:
+            self.tracer("unsolvable")
         return False
-    
-    def find_conflicting_var(self, conflicts, row, col) -> Tuple:
-        """Método que encuentra las variables que entran en conflicto con la que está en una posición dada.
+
+    def count_solutions(self, limit: int = None) -> int:
+        """Método que cuenta las soluciones del tablero sin modificarlo.
+
+        Args:
+            limit (int, optional): cantidad de soluciones a partir de la cual se deja de buscar. Defaults to None. Por defecto se cuentan todas.
+
+        Raises:
+            ValueError: Ocurre si `limit` es menor que 1.
 
         Returns:
-            Tuple: Lista de variable (coordenadas) que causan conflicto.
+            int: cantidad de soluciones encontradas (como máximo `limit`). La primera queda en el atributo `solution`.
         """
-        for conflict in conflicts:
-            if conflict != (row, col):
-                self.conflict_tracker[(row, col)] = conflict
-        
-        if self.verbose:
-            print(f"Conflictos registrados para la celda ({row}, {col}): {conflicts}")
-        
-        return self.conflict_tracker.get((row, col), None)
-  
+        if limit is not None and limit < 1:
+            raise ValueError(f"El límite de soluciones debe ser al menos 1: {limit}")
+        count = 0
+        self.solution = None
+        symbols = self.board.geometry.symbols
+        for grid in self.iter_solutions():
+            if not count:
+                self.solution = "".join(symbols[value - 1] for row in grid for value in row)
+            count += 1
+            if limit is not None and count >= limit:
+                break
+        return count
+
+    def is_unique(self) -> bool:
+        """Método que indica si el tablero tiene exactamente una solución. Se detiene al encontrar la segunda.
+
+        Returns:
+            bool: True si el tablero tiene solución única. False caso contrario.
+        """
+        return self.count_solutions(limit=2) == 1
+
+    def iter_solutions(self):
+        """Generador que enumera perezosamente las soluciones del tablero sin modificarlo.
+
+        Yields:
+            List[List[int]]: cada solución como una matriz de valores (9x9 en el tablero clásico).
+        """
+        geo = self.board.geometry
+        self._build()
+        self.nodes = self.backtracks = 0
+        for rows in self._search([]):
+            grid = [[0] * geo.size for _ in range(geo.size)]
+            for row_id in rows:
+                index, value = divmod(row_id, geo.size)
+                grid[geo.row_of[index]][geo.col_of[index]] = value + 1
+            yield grid
+
+    def _build(self) -> None:
+        """Construye la matriz dispersa de cobertura exacta como listas doblemente enlazadas en arreglos planos.
+
+        El nodo 0 es la raíz, los nodos 1 a `4 * celdas` son las cabeceras de columna y el resto son los nodos de las filas. Para el valor `v`
+        (0 a `size - 1`) en la celda `index` las columnas son: `index`, `celdas + fila * size + v`, `2 * celdas + columna * size + v` y
+        `3 * celdas + subcuadrícula * size + v` (desplazadas en 1). En el tablero clásico, `celdas` es 81 y `size` es 9.
+        """
+        geo = self.board.geometry
+        n, cells = geo.size, geo.cells
+        headers = 4 * cells + 1
+        self.left = list(range(-1, headers - 1))
+        self.left[0] = headers - 1
+        self.right = list(range(1, headers + 1))
+        self.right[-1] = 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        self.row_id = [-1] * headers
+        self.size = [0] * headers
+
+        masks = self.board.masks
+        for index in range(cells):
+            row, col, box = geo.row_of[index], geo.col_of[index], geo.box_of[index]
+            for value in geo.mask_values[masks[index]]:
+                digit = value - 1
+                first = len(self.column)
+                for column in (1 + index, 1 + cells + row * n + digit, 1 + 2 * cells + col * n + digit, 1 + 3 * cells + box * n + digit):
+                    node = len(self.column)
+                    self.column.append(column)
+                    self.row_id.append(index * n + digit)
+                    self.up.append(self.up[column])
+                    self.down.append(column)
+                    self.down[self.up[column]] = node
+                    self.up[column] = node
+                    self.size[column] += 1
+                    self.left.append(node - 1)
+                    self.right.append(first)
+                self.left[first] = first + 3
+                self.right[first + 3] = first
+                for node in range(first, first + 3):
+                    self.right[node] = node + 1
+
+    def _cover(self, column: int) -> None:
+        """Retira una columna y todas las filas que la cubren de la matriz."""
+        left, right, up, down, col_of, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        node = down[column]
+        while node != column:
+            other = right[node]
+            while other != node:
+                down[up[other]] = down[other]
+                up[down[other]] = up[other]
+                size[col_of[other]] -= 1
+                other = right[other]
+            node = down[node]
+
+    def _uncover(self, column: int) -> None:
+        """Reinserta una columna retirada por `_cover`, en el orden inverso."""
+        left, right, up, down, col_of, size = self.left, self.right, self.up, self.down, self.column, self.size
+        node = up[column]
+        while node != column:
+            other = left[node]
+            while other != node:
+                size[col_of[other]] += 1
+                down[up[other]] = other
+                up[down[other]] = other
+                other = left[other]
+            node = up[node]
+        right[left[column]] = column
+        left[right[column]] = column
+
+    def _search(self, solution: List[int]):
+        """Algoritmo X. Cada nivel deja la matriz como la encontró, incluso si el generador se cierra antes de agotarse.
+
+        Raises:
+            TimeoutError: Ocurre si se supera `deadline`.
+
+        Yields:
+            List[int]: identificadores (`índice * size + valor - 1`) de las filas que forman cada solución.
+        """
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise TimeoutError("Se agotó el tiempo de búsqueda.")
+        right, down, size = self.right, self.down, self.size
+        if right[0] == 0:
+            yield list(solution)
+            return
+
+        column = right[0]
+        best = column
+        while column != 0:
+            if size[column] < size[best]:
+                best = column
+                if size[best] <= 1:
+                    break
+            column = right[column]
+        if size[best] == 0:
+            self.backtracks += 1
+            return
+
+        self._cover(best)
+        try:
+            node = down[best]
+            while node != best:
+                self.nodes += 1
+                solution.append(self.row_id[node])
+                other = right[node]
+                while other != node:
+                    self._cover(self.column[other])
+                    other = right[other]
+                try:
+                    yield from self._search(solution)
+                finally:
+                    other = self.left[node]
+                    while other != node:
+                        self._uncover(self.column[other])
+                        other = self.left[other]
+                    solution.pop()
+                node = down[node]
+        finally:
+            self._uncover(best)
+
+
 @dataclass
 class Tester:
     """Clase de pruebas.
@@ -407,17 +1812,24 @@ class Tester:
     sudokus: List[str]
     algorithm: type
     solved_boards: List[SudokuBoard] = field(default_factory=list)
+    cache: object = None
     
-    def string_to_board(self, input: str) -> List[List[int]]:
+    @staticmethod
+    def string_to_board(input: str) -> List[List[int]]:
         """Método que toma una cadea de enteros y trata de convertirla en un input válido para la clase `SudokuBoard`.
 
         Args:
-            input (str): cadena de enteros dada.
+            input (str): cadena de enteros dada, con un símbolo de `SYMBOLS` por celda (81 en el tablero clásico).
+
+        Raises:
+            ValueError: Ocurre si la cadena no tiene la cantidad de caracteres de un tablero admitido.
 
         Returns:
             List[List[int]]: tablero representado en un formato válido.
         """
-        return [[int(input[i*9+j]) for j in range(9)] for i in range(9)]
+        geo = Geometry.for_cells(len(input))
+        size, symbol_value = geo.size, geo.symbol_value
+        return [[symbol_value[input[i*size+j]] for j in range(size)] for i in range(size)]
     
     def pboard(self, board: SudokuBoard) -> None:
         """Método que toma un tablero `SudokuBoard` y lo imprime en pantalla.
@@ -425,7 +1837,8 @@ class Tester:
         Args:
             board (SudokuBoard): tablero a imprimir.
         """
-        for row in [[board.var(row, col).get_value() if board.var(row, col).is_assigned() else 0 for col in range(9)] for row in range(9)]:
+        size = board.geometry.size
+        for row in [[board.var(row, col).get_value() if board.var(row, col).is_assigned() else 0 for col in range(size)] for row in range(size)]:
             print(row)
         print('\n')
             
@@ -436,15 +1849,25 @@ class Tester:
         2. Creación del objeto `SudokuBoard`.
         3. Creación del objeto resolutor.
         4. Intenter resolver el tablero.
-        
+
+        Si se asignó una caché (por ejemplo, `solution_cache.SolutionCache`), los tableros ya resueltos, o equivalentes a uno resuelto, se
+        toman de ella sin volver a resolverlos. La caché solo admite tableros de 9x9; los de otros tamaños se resuelven sin consultarla.
         """
         for chain in self.sudokus:
+            cache = self.cache if len(chain) == 81 else None
+            if cache is not None:
+                solution = cache.get(chain)
+                if solution is not None:
+                    self.solved_boards.append(SudokuBoard(solution))
+                    continue
             initial_values = self.string_to_board(chain)
             board = SudokuBoard(initial_values)
             solver = self.algorithm(board)
             try:
                 if solver.solve() and SudokuValidator.is_valid(solver.board):
                     self.solved_boards.append(solver.board)
+                    if cache is not None:
+                        cache.put(chain, solver.board.to_string())
                 else:
                     pass
             except RuntimeError:
@@ -461,8 +1884,9 @@ sudokus = [
 ]
 
 
-tester = Tester(sudokus=sudokus, algorithm=SudokuSolver)
-tester.play()
-for board in tester.solved_boards:
-    tester.pboard(board=board)
-print(f"Se han resuelto {len(tester.solved_boards)} de {len(sudokus)} tableros")
+if __name__ == "__main__":
+    tester = Tester(sudokus=sudokus, algorithm=SudokuSolver)
+    tester.play()
+    for board in tester.solved_boards:
+        tester.pboard(board=board)
+    print(f"Se han resuelto {len(tester.solved_boards)} de {len(sudokus)} tableros")
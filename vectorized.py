@@ -0,0 +1,192 @@
+import sys
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from batch import BatchResult, solve_batch
+from puzzle_io import CELL_CHARS, read_puzzles
+from sudoku import BIT_COUNT, FULL_MASK, PEERS, UNITS, SudokuSolver
+
+UNDECIDED, SOLVED, INVALID = 0, 1, -1
+"""Estados de cada tablero tras `propagate_batch`."""
+
+PEER_INDEX = np.array(PEERS, dtype=np.intp)
+"""Pares de cada celda como matriz de 81 x 20."""
+
+UNIT_INDEX = np.array(UNITS, dtype=np.intp)
+"""Celdas de cada unidad como matriz de 27 x 9 (filas, columnas y subgrillas)."""
+
+POPCOUNT = np.array(BIT_COUNT, dtype=np.uint8)
+"""Cantidad de candidatos de cada máscara."""
+
+DIGIT_MASK = np.array([FULL_MASK] + [1 << value for value in range(9)], dtype=np.uint16)
+"""Máscara inicial de una celda según su dígito (0 es una celda vacía)."""
+
+MASK_DIGIT = np.array([mask.bit_length() if BIT_COUNT[mask] == 1 else 0 for mask in range(FULL_MASK + 1)], dtype=np.uint8)
+"""Dígito de cada máscara con un único candidato, 0 para el resto."""
+
+
+def to_digits(puzzles: Iterable[str]) -> np.ndarray:
+    """Función que convierte tableros en una matriz de dígitos.
+
+    Args:
+        puzzles (Iterable[str]): tableros como cadenas de 81 caracteres (`0` o `.` para las celdas vacías).
+
+    Raises:
+        ValueError: Ocurre si algún tablero no tiene 81 caracteres válidos.
+
+    Returns:
+        np.ndarray: matriz de N x 81 (uint8) con 0 en las celdas vacías.
+    """
+    puzzles = list(puzzles)
+    if any(len(puzzle) != 81 for puzzle in puzzles):
+        raise ValueError("Cada tablero debe tener 81 caracteres.")
+    digits = np.frombuffer("".join(puzzles).replace(".", "0").encode("ascii", "replace"), dtype=np.uint8).reshape(-1, 81) - ord("0")
+    if (digits > 9).any():
+        raise ValueError("Los tableros solo pueden contener dígitos o '.'.")
+    return digits
+
+
+def to_masks(digits: np.ndarray) -> np.ndarray:
+    """Función que convierte una matriz de dígitos en máscaras de candidatos (el bit `v - 1` indica que el valor `v` es posible).
+
+    Returns:
+        np.ndarray: matriz de N x 81 (uint16).
+    """
+    return DIGIT_MASK[digits]
+
+
+def to_strings(masks: np.ndarray) -> List[str]:
+    """Función que convierte máscaras de candidatos en tableros como cadenas de 81 dígitos (0 en las celdas no asignadas)."""
+    text = (MASK_DIGIT[masks] + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+    return [text[start:start + 81] for start in range(0, len(text), 81)]
+
+
+def validate_batch(masks: np.ndarray, complete: bool = True) -> np.ndarray:
+    """Función equivalente a `SudokuValidator.is_valid` para muchos tableros a la vez.
+
+    Args:
+        masks (np.ndarray): máscaras de N x 81, como las de `to_masks` o `propagate_batch`.
+        complete (bool, optional): si es True se exige además que todas las celdas estén asignadas. Defaults to True.
+
+    Returns:
+        np.ndarray: vector de N booleanos; True si el tablero no repite valores en ninguna unidad (y está completo, si se pidió).
+    """
+    single = POPCOUNT[masks] == 1
+    placed = np.where(single, masks, 0)[:, UNIT_INDEX]
+    distinct = (np.bitwise_or.reduce(placed, axis=2) == np.add.reduce(placed, axis=2, dtype=np.uint16)).all(axis=1)
+    if complete:
+        return distinct & single.all(axis=1)
+    return distinct
+
+
+def propagate_batch(masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Función que propaga restricciones sobre muchos tableros a la vez, hasta que ninguno cambie.
+
+    Cada pasada aplica a todos los tableros activos la eliminación de pares (un valor asignado se descarta de sus 20 pares) y los
+    *hidden singles* (si un valor tiene un único lugar posible en una unidad, se asigna ahí). Los tableros que quedan resueltos, los que
+    llegan a una contradicción y los que dejan de cambiar salen de las pasadas siguientes.
+
+    Args:
+        masks (np.ndarray): máscaras de N x 81, como las de `to_masks`. No se modifican.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: máscaras propagadas y estado de cada tablero (`SOLVED`, `INVALID` o `UNDECIDED`).
+    """
+    masks = np.array(masks, dtype=np.uint16)
+    status = np.full(len(masks), UNDECIDED, dtype=np.int8)
+    active = np.arange(len(masks))
+    while active.size:
+        current = masks[active]
+        updated, invalid = _propagate_round(current)
+        complete = (POPCOUNT[updated] == 1).all(axis=1) & ~invalid
+        solved = complete & validate_batch(updated, complete=False)
+        invalid |= complete & ~solved
+        masks[active] = updated
+        status[active[solved]] = SOLVED
+        status[active[invalid]] = INVALID
+        active = active[~(invalid | solved) & (updated != current).any(axis=1)]
+    return masks, status
+
+
+def _propagate_round(masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Aplica una pasada de eliminación de pares y *hidden singles*. Retorna las nuevas máscaras y los tableros en contradicción."""
+    single = POPCOUNT[masks] == 1
+    seen = np.bitwise_or.reduce(np.where(single, masks, 0)[:, PEER_INDEX], axis=2)
+    invalid = (single & (masks & seen != 0)).any(axis=1)
+    masks = np.where(single, masks, masks & ~seen)
+
+    in_unit = masks[:, UNIT_INDEX]
+    for value in range(9):
+        bit = np.uint16(1 << value)
+        present = (in_unit & bit) != 0
+        count = present.sum(axis=2)
+        invalid |= (count == 0).any(axis=1)
+        boards, units = np.nonzero(count == 1)
+        cells = UNIT_INDEX[units, present[boards, units].argmax(axis=1)]
+        masks[boards, cells] = bit
+
+    invalid |= (masks == 0).any(axis=1)
+    return masks, invalid
+
+
+def solve_vectorized(puzzles: Iterable[str], algorithm: type = SudokuSolver, chunksize: int = 4096, workers: int = 1,
+                     timeout: float = None) -> Iterator[BatchResult]:
+    """Generador que resuelve un lote de tableros propagando restricciones en bloque y delegando al resolutor solo los indecisos.
+
+    Los tableros se procesan en bloques de `chunksize`. Los que la propagación vectorizada resuelve o descarta no llegan a construir un
+    `SudokuBoard`; el resto se resuelve con `solve_batch` partiendo del tablero ya propagado.
+
+    Args:
+        puzzles (Iterable[str]): tableros como cadenas de 81 caracteres.
+        algorithm (type, optional): clase resolutora para los tableros indecisos. Defaults to SudokuSolver.
+        chunksize (int, optional): tableros por bloque. Defaults to 4096.
+        workers (int, optional): procesos para los tableros indecisos (ver `solve_batch`). Defaults to 1.
+        timeout (float, optional): segundos máximos de búsqueda por tablero indeciso. Defaults to None.
+
+    Yields:
+        BatchResult: resultado de cada tablero, en el orden de la entrada. En los tableros resueltos por la propagación, `elapsed` es el
+            tiempo del bloque repartido entre sus tableros.
+    """
+    iterator = iter(puzzles)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield from _solve_chunk(chunk, offset, algorithm, workers, timeout)
+        offset += len(chunk)
+
+
+def _solve_chunk(chunk: List[str], offset: int, algorithm: type, workers: int, timeout: float) -> List[BatchResult]:
+    """Resuelve un bloque de `solve_vectorized`."""
+    start = time.perf_counter()
+    wellformed = [position for position, puzzle in enumerate(chunk) if len(puzzle) == 81 and all(char in CELL_CHARS for char in puzzle)]
+    masks, status = propagate_batch(to_masks(to_digits(chunk[position] for position in wellformed)))
+    grids = to_strings(masks)
+    share = (time.perf_counter() - start) / len(chunk)
+
+    results = [BatchResult(offset + position, puzzle, None, "invalid", share) for position, puzzle in enumerate(chunk)]
+    undecided = []
+    for row, position in enumerate(wellformed):
+        if status[row] == SOLVED:
+            results[position] = BatchResult(offset + position, chunk[position], grids[row], "solved", share)
+        elif status[row] == UNDECIDED:
+            undecided.append((position, grids[row]))
+
+    for (position, _), result in zip(undecided, solve_batch((grid for _, grid in undecided), algorithm, workers, timeout=timeout)):
+        result.index, result.puzzle, result.elapsed = offset + position, chunk[position], result.elapsed + share
+        results[position] = result
+    return results
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "boards.txt"
+    solved = total = 0
+    for result in solve_vectorized(record.puzzle for record in read_puzzles(path)):
+        total += 1
+        solved += result.status == "solved"
+        print(result.solution or result.puzzle, result.status, f"{result.elapsed:.4f}")
+    print(f"Se han resuelto {solved} de {total} tableros")